@@ -2,54 +2,102 @@
 WINDOW = 50
 INF = 10**9
 
-from source_code_files.game.moves import generate_moves
-from source_code_files.game.apply_move import apply_move
+from source_code_files.game.moves import (
+    generate_moves, generate_captures, generate_quiets, is_pseudo_legal, move_to_str, MOVE_SQUARES, MOVE_CAPTURE,
+    RANK_2, RANK_7,
+)
+from source_code_files.game.board import Board
 from source_code_files.game.terminal import is_terminal
-from source_code_files.game.evaluation import evaluate
+from source_code_files.game.evaluation import evaluate, RANK_MASKS
+from source_code_files.game.see import see_capture
+from source_code_files.game.eval_cache import EvalCache
+from source_code_files.agents.transposition import TranspositionTable, EXACT, LOWER, UPPER
+from source_code_files.agents.parallel import LazySMP, RootSplit
+from source_code_files.agents.timeman import TimeManager, DECIDED_SCORE
+from array import array
 import time
 
-MAX_QDEPTH = 8
+# quiescence: plies of captures / promotion pushes below the horizon
+MAX_QDEPTH = 6
 
-def pos_key(state):
-    return (state.white, state.black, state.side, state.en_passant)
+# delta pruning: a capture is skipped if stand pat + its SEE gain + DELTA_MARGIN
+# still does not reach alpha (the margin covers the positional swing)
+DELTA_MARGIN = 100
 
+# evaluation of a finished game (a side promoted or lost all pawns)
+WIN_SCORE = 10_000
 
-def is_capture(state, move):
-    _, to_sq = move
-    to_mask = 1 << to_sq
-    if state.side == 'w':
-        return (to_mask & state.black) != 0 or (state.en_passant is not None and to_sq == state.en_passant)
-    else:
-        return (to_mask & state.white) != 0 or (state.en_passant is not None and to_sq == state.en_passant)
+# iterative deepening limit when depth=None (the time manager stops earlier)
+MAX_DEPTH = 64
 
+# root split: shallower iterations are searched serially
+ROOT_SPLIT_MIN_DEPTH = 3
 
-def immediate_recapture_possible(next_state, target_sq):
-    target_mask = 1 << target_sq
-    for _, to_sq in generate_moves(next_state):
-        if (1 << to_sq) & target_mask:
-            return True
-    return False
+# time polling: the clock is read every _poll_interval calls of _timed_out,
+# with the interval adapted so that polls are ~poll_latency seconds apart
+POLL_INTERVAL_START = 256
+POLL_INTERVAL_MAX = 8192
+
+# history / counter-move index: from/to squares of the packed move + side
+BLACK_OFFSET = MOVE_SQUARES + 1
+HISTORY_SIZE = 2 * BLACK_OFFSET
+
+# killers: two slots per ply from the root
+MAX_PLY = MAX_DEPTH + 1
+
+# the whole history table is halved once an entry passes this (and every search)
+HISTORY_MAX = 1 << 20
 
-def capture_moves_only(state):
-    moves = generate_moves(state)
-    caps = []
-    for m in moves:
-        if is_capture(state, m):
-            caps.append(m)
-    return caps
+# frontier pruning (futility, razoring) at depth_remaining <= FRONTIER_DEPTH,
+# margins by depth_remaining
+FRONTIER_DEPTH = 2
+FUTILITY_MARGIN = (0, 120, 250)
+RAZOR_MARGIN = (0, 200, 350)
 
+# late move reductions: quiet moves after the first LMR_MIN_MOVES, from
+# depth_remaining >= LMR_MIN_DEPTH; one ply less, two after LMR_LATE_MOVES
+LMR_MIN_DEPTH = 3
+LMR_MIN_MOVES = 3
+LMR_LATE_MOVES = 8
+
+# pawns one or two steps from promotion: no frontier pruning in such positions
+NEAR_PROMO_WHITE = RANK_MASKS[5] | RANK_MASKS[6]
+NEAR_PROMO_BLACK = RANK_MASKS[1] | RANK_MASKS[2]
+
+# search statistics (self.stats), reset every search
+STATS = ("pvs_researches", "lmr_reductions", "lmr_researches", "futility_prunes", "razor_cuts",
+         "delta_prunes", "eval_cache_probes", "eval_cache_hits")
 
 
 class AlphaBetaAgent:
-    def __init__(self, depth=3):
+    def __init__(self, depth=None, tt_bits=20, check_eval=False, max_nodes=None, poll_latency=0.005,
+                 tablebase=None, book=None, workers=1, parallel="smp", time_manager=True,
+                 pvs=True, lmr=True, futility=True, razoring=True, eval_cache_bits=16):
         self.nodes = 0
         self.last_completed_depth = 0
 
         self.qnodes = 0
         self.max_qdepth_reached = 0
 
+        # maximum iteration depth, None = as deep as the clock allows
         self.depth = depth
 
+        # optional node budget (nodes + qnodes), used by the benchmark
+        self.max_nodes = max_nodes
+
+        # one entry per completed iteration of the last search
+        self.iterations = []
+
+        # search stop state (see _timed_out)
+        self.poll_latency = poll_latency
+        self._deadline = None           # time.monotonic() value, None = no clock
+        self._stop = False
+        self._poll_countdown = 1
+        self._poll_interval = POLL_INTERVAL_START
+        self._last_poll = 0.0
+        self.polls = 0
+        self.max_overshoot = 0.0        # worst (stop detected - deadline), seconds
+
         # total game clock (set once from server "Time N")
         self.game_start = None
         self.game_time_limit_sec = None  # FIXED
@@ -57,11 +105,66 @@ class AlphaBetaAgent:
         self._agent_time_left = None   # seconds
         self._agent_running_since = None  # timestamp when agent clock resumed
 
-
-        self.tt_best = {}
-        self.counter_move = {}
-        self.killers = {}
-        self.history = {}
+        # per-move soft / hard budgets while a clock is set (timeman.TimeManager);
+        # without one a search may use the whole remaining clock
+        self.timeman = TimeManager() if time_manager else None
+        self._budget = None             # the time manager during a timed search
+        self.moves_played = 0           # our moves this game (not plies)
+
+        # fixed-size table: memory stays flat across a whole tournament
+        self.tt = TranspositionTable(tt_bits)
+        self.tt_cuts = 0
+
+        # pawn-structure evaluation cache (2 ** eval_cache_bits entries, 0 = off),
+        # kept across moves and games: entries only depend on the position
+        self.eval_cache_bits = eval_cache_bits
+        self.eval_cache = EvalCache(eval_cache_bits) if eval_cache_bits else None
+
+        # move ordering tables, fixed-size flat arrays (0 = no move):
+        #   history[side + from/to]       cutoff bonus, aged every search
+        #   counter_move[side + from/to]  refutation of the opponent's last move
+        #   killers[2 * ply], [2 * ply + 1]  quiet cutoff moves at that ply
+        # new_game() clears them
+        self.history = array('i', [0]) * HISTORY_SIZE
+        self.counter_move = array('H', [0]) * HISTORY_SIZE
+        self.killers = array('H', [0]) * (2 * MAX_PLY)
+        # set by ponder(): the table and history are already aged for our next move
+        self._aged = False
+
+        # search features, switchable for A/B runs (match.py / sprt.py / bench.py --agent)
+        self.pvs = pvs
+        self.lmr = lmr
+        self.futility = futility
+        self.razoring = razoring
+        self.stats = dict.fromkeys(STATS, 0)
+
+        # debug: cross-check the board's incremental evaluation against evaluate()
+        self.check_eval = check_eval
+
+        # optional tablebase.Tablebase: exact scores once few pawns are left
+        self.tablebase = tablebase
+        self.tb_hits = 0
+
+        # optional book.Book: known positions are played without searching
+        self.book = book
+
+        # parallel search with `workers` processes:
+        #   "smp"   Lazy SMP, workers - 1 helpers share the transposition table
+        #   "root"  root moves after the first are split over a process pool
+        if parallel not in ("smp", "root"):
+            raise ValueError(f"unknown parallel mode {parallel!r}")
+        self.workers = workers
+        self.parallel = parallel
+        self._smp = None
+        self._root_split = None
+        self.helper_nodes = 0
+
+        # set by parallel helpers: external stop flag (checked on every clock poll),
+        # first iteration depth and root move rotation
+        self.stop_event = None
+        self.start_depth = 1
+        self.root_shift = 0
+        self.verbose = True
 
     def set_time_left(self, seconds: float):
         self._agent_time_left = max(0.0, float(seconds))
@@ -76,105 +179,290 @@ class AlphaBetaAgent:
         # total time the agent is allowed to consume in the whole game
         self._agent_time_left = float(time_limit_minutes) * 60.0
         self._agent_running_since = None
+        self.moves_played = 0
 
     def resume_clock(self):
         # call right before agent starts thinking
         if self._agent_time_left is None:
             return
         if self._agent_running_since is None:
-            self._agent_running_since = time.time()
+            self._agent_running_since = time.monotonic()
 
     def pause_clock(self):
         # call right after agent finishes thinking (or when it's human's turn)
         if self._agent_time_left is None:
             return
         if self._agent_running_since is not None:
-            spent = time.time() - self._agent_running_since
+            spent = time.monotonic() - self._agent_running_since
             self._agent_time_left -= spent
             self._agent_running_since = None
             if self._agent_time_left < 0:
                 self._agent_time_left = 0
 
-    def _timed_out(self) -> bool:
+    def _start_search_clock(self):
+        # precompute the deadline once per search; called right after resume_clock
+        self._stop = False
+        self._poll_countdown = 1
+        self._last_poll = time.monotonic()
+        self.polls = 0
         if self._agent_time_left is None:
-            return False
-
-        # if clock is running, compute current remaining
-        if self._agent_running_since is not None:
-            remaining = self._agent_time_left - (time.time() - self._agent_running_since)
+            self._deadline = None
         else:
-            remaining = self._agent_time_left
+            self._deadline = self._last_poll + self._agent_time_left
 
-        return remaining <= 0
+    def _timed_out(self) -> bool:
+        # cheap path: a counter decrement on almost every call
+        if self._stop:
+            return True
+        if self.max_nodes is not None and self.nodes + self.qnodes >= self.max_nodes:
+            self._stop = True
+            return True
+        self._poll_countdown -= 1
+        if self._poll_countdown > 0:
+            return False
+        return self._poll_clock()
+
+    def _poll_clock(self) -> bool:
+        now = time.monotonic()
+        self.polls += 1
+
+        # adapt the interval to the measured call rate
+        dt = now - self._last_poll
+        if dt > 0:
+            interval = int(self._poll_interval * self.poll_latency / dt)
+            self._poll_interval = max(1, min(POLL_INTERVAL_MAX, (self._poll_interval + interval) // 2))
+        self._last_poll = now
+        self._poll_countdown = self._poll_interval
+
+        if self.stop_event is not None and self.stop_event.is_set():
+            self._stop = True
+        elif self._deadline is not None and now >= self._deadline:
+            self.max_overshoot = max(self.max_overshoot, now - self._deadline)
+            self._stop = True
+        return self._stop
+
+    def new_game(self):
+        # a new game / tournament round: forget the move ordering of the last one
+        # (the transposition table keeps its entries, they age out by generation)
+        self.history = array('i', [0]) * HISTORY_SIZE
+        self.counter_move = array('H', [0]) * HISTORY_SIZE
+        self.killers = array('H', [0]) * (2 * MAX_PLY)
+        self._aged = False
+
+    def new_search(self):
+        # per move: age the table and the history, killers are per root position.
+        # Aging happens once per move: after a ponder miss the real search keeps
+        # the generation (and history) the ponder search filled
+        if self._aged:
+            self._aged = False
+        else:
+            self.tt.new_search()
+            self._age_history()
+        if self.eval_cache is not None:
+            self.eval_cache.probes = self.eval_cache.hits = 0
+        self.killers = array('H', [0]) * (2 * MAX_PLY)
+
+    def _age_history(self):
+        self.history = array('i', [v >> 1 for v in self.history])
+
+    def _add_history(self, index, bonus):
+        history = self.history
+        history[index] += bonus
+        if history[index] > HISTORY_MAX:
+            self._age_history()
+
+    def _static_eval(self, board):
+        # side-to-move score from the board's incremental accumulator / the eval cache
+        s = board.evaluate(self.eval_cache)
+        if self.check_eval:
+            full = evaluate(board)
+            if s != full:
+                raise AssertionError(f"incremental eval {s} != evaluate {full} for {board.to_state()}")
+        return s if board.side == 'w' else -s
+
+
+    def _probe_tablebase(self, board, alpha, beta):
+        # clamped (fail-hard) tablebase score, or None if not covered
+        score = self.tablebase.probe(board)
+        if score is None:
+            return None
+        self.tb_hits += 1
+        return max(alpha, min(beta, score))
+
+    def _quiesce(self, board, alpha, beta, qdepth=0):
+        """
+        Captures (and promotion pushes) until the position is quiet.
+        One evaluation per node: terminal positions are recognised by its
+        +-WIN_SCORE. Captures unable to bring the score near alpha (stand
+        pat + SEE gain, delta pruning) are skipped; with pawns only a capture
+        never loses material (SEE >= 0), so there is no losing-capture rule.
+        A pawn of the opponent about to promote takes away the stand-pat option.
+        """
+        if self._timed_out():
+            raise TimeoutError
 
+        stand = self._static_eval(board)
+        if stand == WIN_SCORE or stand == -WIN_SCORE:
+            return stand
 
+        if self.tablebase is not None:
+            tb_score = self._probe_tablebase(board, alpha, beta)
+            if tb_score is not None:
+                return tb_score
 
-    def _quiesce(self, state, alpha, beta, qdepth=0):
-        # timed out
-        if self._timed_out():
-            raise TimeoutError
-        if is_terminal(state):
-            s = evaluate(state)
-            return s if state.side == 'w' else -s
+        # any stored result (depth >= 0) is good enough here
+        entry = self.tt.probe(board.key)
+        if entry is not None:
+            _, tt_score, bound, _ = entry
+            if bound == EXACT or (bound == LOWER and tt_score >= beta) or (bound == UPPER and tt_score <= alpha):
+                self.tt_cuts += 1
+                return max(alpha, min(beta, tt_score))
 
         self.qnodes += 1
         if qdepth > self.max_qdepth_reached:
             self.max_qdepth_reached = qdepth
 
-        # stand-pat evaluation
-        stand = evaluate(state)
-        stand = stand if state.side == 'w' else -stand
+        white, black, side = board.white, board.black, board.side
+        empty = ~(white | black)
+        if side == 'w':
+            ours_promote = white & RANK_7 & (empty >> 8)
+            theirs_promote = black & RANK_2 & (empty << 8)
+        else:
+            ours_promote = black & RANK_2 & (empty << 8)
+            theirs_promote = white & RANK_7 & (empty >> 8)
 
-        if qdepth >= 6:
-            return stand
+        # stand pat, unless the opponent promotes next move whatever we do quietly
+        if theirs_promote:
+            stand = -WIN_SCORE
 
+        alpha_orig = alpha
         if stand >= beta:
+            self.tt.store(board.key, 0, beta, LOWER, None)
             return beta
         if stand > alpha:
             alpha = stand
 
         if qdepth >= MAX_QDEPTH:
-            return stand
-
-        # only captures (incl. en passant via is_capture)
-        caps = capture_moves_only(state)
-        if not caps:
             return alpha
 
-        # order captures using your existing ordering (works fine)
-        caps = self._order_moves(state, caps, depth_remaining=0, last_move=None)
+        # promotion pushes win on the spot: try them first
+        moves = []
+        step = 8 if side == 'w' else -8
+        while ours_promote:
+            from_sq = (ours_promote & -ours_promote).bit_length() - 1
+            ours_promote &= ours_promote - 1
+            moves.append(from_sq | ((from_sq + step) << 6))
 
-        for mv in caps:
-            if self._timed_out():
-                raise TimeoutError
-            nxt = apply_move(state, mv)
-            score = -self._quiesce(nxt, -beta, -alpha, qdepth + 1)
+        # captures by SEE then advancement; those that cannot reach alpha are not searched
+        scored = []
+        for m in generate_captures(board):
+            gain = see_capture(white, black, side, m)
+            if not theirs_promote and stand + gain + DELTA_MARGIN <= alpha:
+                self.stats["delta_prunes"] += 1
+                continue
+            to_rank = ((m >> 6) & 63) >> 3
+            scored.append((gain * 8 + (to_rank if side == 'w' else 7 - to_rank), m))
+        scored.sort(reverse=True)
+        moves += [m for _, m in scored]
+
+        best = None
+        for mv in moves:
+            board.make_move(mv)
+            score = -self._quiesce(board, -beta, -alpha, qdepth + 1)
+            board.unmake_move()
 
             if score >= beta:
+                self.tt.store(board.key, 0, beta, LOWER, mv)
                 return beta
 
             if score > alpha:
                 alpha = score
+                best = mv
 
-            # 🔥 EARLY EXIT — חשוב מאוד
-            if alpha >= beta:
-                return alpha
-
+        self.tt.store(board.key, 0, alpha, EXACT if alpha > alpha_orig else UPPER, best)
         return alpha
 
     def choose_move(self, state, last_move=None):
+        self.nodes = 0
+        self.qnodes = 0
+        self.helper_nodes = 0
+
         # If game time already over, stop (client decides what to do)
-        if self._timed_out():
+        if self._agent_time_left is not None and self._agent_time_left <= 0:
             return None
+
+        if self.book is not None:
+            move = self.book.choose(state)
+            if move is not None:
+                self.iterations = []
+                self.moves_played += 1
+                print(f"\nbook move: {move_to_str(move)}")
+                return move
+
+        # normally done before the game (client.py); process start-up is not ours to pay
+        if self.workers > 1:
+            self.start_workers()
+
         self.resume_clock()
-        self.qnodes = 0
+        self._start_search_clock()
         self.max_qdepth_reached = 0
+        self.tt_cuts = 0
+        self.tb_hits = 0
+        self.stats = dict.fromkeys(STATS, 0)
 
         print("\nCOMPUTER MOVE !!!!!!!!!!!!!!!!!!!!!!!!!")
         print("I'm thinking ........")
 
-        move_start = time.time()
-        self.nodes = 0
+        if self.timeman is not None and self._deadline is not None:
+            # the hard budget replaces the end of the clock as the deadline
+            soft, hard = self.timeman.start(self._agent_time_left, self.moves_played,
+                                            (state.white | state.black).bit_count(),
+                                            len(generate_moves(state)))
+            self._deadline = self._last_poll + hard
+            self._budget = self.timeman
+            print(f"time budget: soft {soft:.2f} s | hard {hard:.2f} s")
+
+        if self._smp is not None:
+            best_move, best_val = self._smp.search(state, last_move)
+        else:
+            if self._root_split is not None:
+                self._root_split.new_search()
+            self.new_search()
+            best_move, best_val = self._iterate(Board.from_state(state), last_move)
+
+        self._budget = None
+        self.pause_clock()
+        if best_move is not None:
+            self.moves_played += 1
+        if self.eval_cache is not None:
+            self.stats["eval_cache_probes"] = self.eval_cache.probes
+            self.stats["eval_cache_hits"] = self.eval_cache.hits
+        remaining = round(self.get_time_left(), 2)
+
+        if self._timed_out():
+            print("\ntime is done (timeout)")
+        else:
+            print("\nsearch finished")
+
+        print(f"clock: {remaining} seconds")
+        print(f"\nfinal score: {best_val}\n")
+        print(f"qnodes: {self.qnodes} | max_qdepth: {self.max_qdepth_reached} | tt cuts: {self.tt_cuts} | tb hits: {self.tb_hits}")
+        print(" | ".join(f"{k}: {v}" for k, v in self.stats.items()))
+        print(f"clock polls: {self.polls} | worst overshoot: {self.max_overshoot * 1000:.1f} ms")
+        if self.workers > 1:
+            print(f"helper nodes: {self.helper_nodes}")
+
+        return best_move
+
+    def _iterate(self, board, last_move=None):
+        """
+        Iterative deepening from self.start_depth to self.depth (MAX_DEPTH if
+        None) with aspiration windows, until done, stopped or the time manager
+        has no time for the next iteration. Returns (best_move, best_val) of the
+        deepest completed iteration; self.iterations gets one entry per iteration.
+        """
+        self.iterations = []
+        move_start = time.monotonic()
 
         best_move = None
         best_val = 0
@@ -182,29 +470,34 @@ class AlphaBetaAgent:
         # Start with wide window first time
         alpha = -INF
         beta = INF
+        widen = WINDOW
 
-        # Iterative deepening up to self.depth (IMPORTANT)
-        depth = 1
-        while depth <= self.depth:
+        max_depth = MAX_DEPTH if self.depth is None else self.depth
+        depth = self.start_depth
+        while depth <= max_depth:
             if self._timed_out():
                 break
 
             try:
                 # Search once in current window
-                move, val = self._root_alphabeta(state, depth, alpha, beta, last_move)
+                move, val = self._root_alphabeta(board, depth, alpha, beta, last_move)
 
+                # no legal moves
                 if move is None:
                     break
 
                 if self._timed_out():
                     break
 
-                # Aspiration handling (improved): only widen the side that failed
+                # Aspiration handling: only widen the side that failed, twice as far each time
+                # (fail-hard: val is the bound itself, a decided score can be far away)
                 if val >= beta:
-                    beta = val + WINDOW
+                    beta = val + widen
+                    widen *= 2
                     continue
                 if val <= alpha:
-                    alpha = val - WINDOW
+                    alpha = val - widen
+                    widen *= 2
                     continue
 
                 # Success: accept result
@@ -213,101 +506,184 @@ class AlphaBetaAgent:
 
                 self.last_completed_depth = depth
 
-                elapsed = time.time() - move_start
+                elapsed = time.monotonic() - move_start
                 bf = int(self.nodes ** (1 / depth)) if self.nodes > 0 else 0
 
-                print(f"depth = {depth} | score = {best_val}")
-                print(f"branching factor = {bf}")
+                self.iterations.append({
+                    "depth": depth,
+                    "score": best_val,
+                    "move": best_move,
+                    "nodes": self.nodes,
+                    "qnodes": self.qnodes,
+                    "time": elapsed,
+                })
+
+                if self.verbose:
+                    print(f"depth = {depth} | score = {best_val}")
+                    print(f"branching factor = {bf}")
+
+                if self._budget is not None and not self._budget.next_iteration(
+                        depth, best_move, best_val, elapsed, self.nodes + self.qnodes):
+                    break
 
                 # Prepare next iteration window around val
                 alpha = best_val - WINDOW
                 beta = best_val + WINDOW
+                widen = WINDOW
                 depth += 1
 
             except TimeoutError:
                 break
 
+        # searching the board in place: a timeout mid-line leaves moves on it
+        while board._undo:
+            board.unmake_move()
 
+        return best_move, best_val
 
-        self.pause_clock()
-        remaining = round(self._agent_time_left, 2)
-
-        if self._timed_out():
-            print("\ntime is done (timeout)")
+    def ponder(self, state, last_move, stop_event):
+        """
+        Search state (our move next, after the predicted reply) on the
+        opponent's time: no deadline and no clock charged, runs until
+        stop_event is set or self.depth (MAX_DEPTH if None) is done. The transposition table
+        keeps what was found for the real search.
+        Returns (best_move, best_val, completed_depth).
+        """
+        self.nodes = 0
+        self.qnodes = 0
+        self.stats = dict.fromkeys(STATS, 0)
+        self.stop_event = stop_event
+        self.verbose = False
+        # pool workers have no way to see stop_event
+        split, self._root_split = self._root_split, None
+        try:
+            self._start_search_clock()
+            self._deadline = None
+            self._aged = False
+            self.new_search()
+            # the search for our next move (after a miss) must not age it again
+            self._aged = True
+            best_move, best_val = self._iterate(Board.from_state(state), last_move)
+        finally:
+            self.stop_event = None
+            self.verbose = True
+            self._root_split = split
+
+        depth = self.iterations[-1]["depth"] if self.iterations else 0
+        return best_move, best_val, depth
+
+    def ponder_hit(self):
+        # a move found by ponder() is played without choose_move: it still counts
+        # as one of ours for the time manager; the next move ages the table again
+        self.moves_played += 1
+        self._aged = False
+
+    def search_options(self):
+        # constructor flags that change the search, for helper processes
+        return {"pvs": self.pvs, "lmr": self.lmr, "futility": self.futility, "razoring": self.razoring}
+
+    def start_workers(self):
+        # start the parallel search processes now instead of on the first search
+        if self.workers <= 1 or self._smp is not None or self._root_split is not None:
+            return
+        if self.parallel == "smp":
+            self._smp = LazySMP(self, self.workers)
         else:
-            print("\nsearch finished")
-
-        print(f"clock: {remaining} seconds")
-        print(f"\nfinal score: {best_val}\n")
-        print(f"qnodes: {self.qnodes} | max_qdepth: {self.max_qdepth_reached}")
+            self._root_split = RootSplit(self, self.workers)
 
-        return best_move
+    def close(self):
+        # stop the parallel search processes (if any)
+        if self._smp is not None:
+            self._smp.close()
+            self._smp = None
+        if self._root_split is not None:
+            self._root_split.close()
+            self._root_split = None
 
     # -------------------------
-    # Move ordering (5 layers)
+    # Staged move picker
     # -------------------------
-    def _order_moves(self, state, moves, depth_remaining, last_move):
-        key = pos_key(state)
-        hash_move = self.tt_best.get(key)
-
-        cmove = None
+    def _pick_moves(self, board, last_move):
+        """
+        Yields moves stage by stage, so a cutoff in an early stage skips
+        generating / scoring the later ones:
+          1) hash move (checked with is_pseudo_legal, it may be a collision)
+          2) captures, by SEE then advancement
+          3) counter move and killers (quiet, pseudo-legal)
+          4) remaining quiet moves, by history
+        The board may be changed between yields but must be restored.
+        """
+        side_off = 0 if board.side == 'w' else BLACK_OFFSET
+
+        hash_move = self.tt.best_move(board.key)
+        if hash_move is not None and is_pseudo_legal(board, hash_move):
+            yield hash_move
+        else:
+            hash_move = None
+
+        caps = generate_captures(board)
+        if caps:
+            white, black, side = board.white, board.black, board.side
+            scored = []
+            for m in caps:
+                if m == hash_move:
+                    continue
+                # exchange result on the target square: +100 wins a pawn, 0 is a trade
+                to_sq = (m >> 6) & 63
+                s = 1000 * see_capture(white, black, side, m)
+                s += (to_sq // 8) if side == 'w' else (7 - (to_sq // 8))
+                scored.append((s, m))
+            scored.sort(reverse=True, key=lambda x: x[0])
+            for _, m in scored:
+                yield m
+
+        cmove = 0
         if last_move is not None:
-            cmove = self.counter_move.get((last_move[0], last_move[1], state.side))
-
-        killer1, killer2 = self.killers.get(depth_remaining, [None, None])
-
-        scored = []
-        for m in moves:
-            s = 0
-
-            if hash_move is not None and m == hash_move:
-                s += 1_000_000
-
-            cap = is_capture(state, m)
-            if cap:
-                next_state = apply_move(state, m)
-                _, to_sq = m
-                recaptured = immediate_recapture_possible(next_state, to_sq)
-                s += 900_000 if not recaptured else 800_000
-                s += (to_sq // 8) if state.side == 'w' else (7 - (to_sq // 8))
-            else:
-                if cmove is not None and m == cmove:
-                    s += 700_000
-                if killer1 is not None and m == killer1:
-                    s += 600_000
-                elif killer2 is not None and m == killer2:
-                    s += 590_000
-
-                f, t = m
-                s += self.history.get((state.side, f, t), 0)
-
-            scored.append((s, m))
-
-        scored.sort(reverse=True, key=lambda x: x[0])
-        return [m for _, m in scored]
+            cmove = self.counter_move[(last_move & MOVE_SQUARES) + side_off]
+        k = 2 * min(len(board._undo), MAX_PLY - 1)
+
+        special = []
+        for m in (cmove, self.killers[k], self.killers[k + 1]):
+            if not m or m == hash_move or m & MOVE_CAPTURE or m in special:
+                continue
+            if is_pseudo_legal(board, m):
+                special.append(m)
+                yield m
+
+        quiets = generate_quiets(board)
+        history = self.history
+        quiets.sort(reverse=True, key=lambda m: history[(m & MOVE_SQUARES) + side_off])
+        for m in quiets:
+            if m != hash_move and m not in special:
+                yield m
 
     # -------------------------
     # Alpha–Beta (Negamax)
     # -------------------------
-    def _alphabeta(self, state, depth_remaining, alpha, beta, last_move):
+    def _alphabeta(self, board, depth_remaining, alpha, beta, last_move):
         self.nodes += 1
 
         if self._timed_out():
             raise TimeoutError
 
-        if is_terminal(state):
-            s = evaluate(state)
-            return s if state.side == 'w' else -s
+        if is_terminal(board):
+            return self._static_eval(board)
 
-        if depth_remaining == 0:
-            return self._quiesce(state, alpha, beta)
+        if self.tablebase is not None:
+            tb_score = self._probe_tablebase(board, alpha, beta)
+            if tb_score is not None:
+                return tb_score
 
+        if depth_remaining == 0:
+            return self._quiesce(board, alpha, beta)
 
+        entry = self.tt.probe(board.key)
+        if entry is not None and entry[0] >= depth_remaining:
+            _, tt_score, bound, _ = entry
+            if bound == EXACT or (bound == LOWER and tt_score >= beta) or (bound == UPPER and tt_score <= alpha):
+                self.tt_cuts += 1
+                return max(alpha, min(beta, tt_score))
 
-        moves = generate_moves(state)
-        if not moves:
-            s = evaluate(state)
-            return s if state.side == 'w' else -s
         # -------------------------
         # Null Move Pruning (SAFE)
         # -------------------------
@@ -340,30 +716,85 @@ class AlphaBetaAgent:
         #         if score >= beta:
         #             return beta
 
-        moves = self._order_moves(state, moves, depth_remaining, last_move)
+        # -------------------------
+        # Frontier pruning
+        # -------------------------
+        # zero-window nodes only, never close to a decided score or a promotion
+        futile = False
+        if (
+                (self.futility or self.razoring)
+                and depth_remaining <= FRONTIER_DEPTH
+                and beta - alpha == 1
+                and -DECIDED_SCORE < alpha < DECIDED_SCORE
+                and not (board.white & NEAR_PROMO_WHITE or board.black & NEAR_PROMO_BLACK)
+        ):
+            static = self._static_eval(board)
+
+            # razoring: far below alpha, let quiescence confirm the fail low
+            if self.razoring and static + RAZOR_MARGIN[depth_remaining] <= alpha:
+                val = self._quiesce(board, alpha, beta)
+                if depth_remaining == 1 or val <= alpha:
+                    self.stats["razor_cuts"] += 1
+                    return val if depth_remaining == 1 else alpha
+
+            # futility: quiet moves cannot lift the score to alpha
+            futile = self.futility and static + FUTILITY_MARGIN[depth_remaining] <= alpha
+
         best_move_local = None
+        side_off = 0 if board.side == 'w' else BLACK_OFFSET
+        # passed pawns' pushes are never pruned or reduced
+        passed = board.passed_w if board.side == 'w' else board.passed_b
+        searched = 0
+        pruned = 0
 
-        for move in moves:
+        for move in self._pick_moves(board, last_move):
             if self._timed_out():
                 raise TimeoutError
 
-            next_state = apply_move(state, move)
+            quiet = not move & MOVE_CAPTURE and not passed >> (move & 63) & 1
+            if futile and quiet:
+                self.stats["futility_prunes"] += 1
+                pruned += 1
+                continue
+            searched += 1
+
+            board.make_move(move)
             new_depth = depth_remaining - 1
-            val = -self._alphabeta(next_state, new_depth, -beta, -alpha, last_move=move)
+
+            reduction = 0
+            if self.lmr and quiet and depth_remaining >= LMR_MIN_DEPTH and searched > LMR_MIN_MOVES:
+                reduction = 1 if searched <= LMR_LATE_MOVES else 2
+                self.stats["lmr_reductions"] += 1
+                val = -self._alphabeta(board, max(1, new_depth - reduction), -alpha - 1, -alpha, last_move=move)
+                if val > alpha:
+                    self.stats["lmr_researches"] += 1
+                    reduction = 0
+
+            if not reduction:
+                if self.pvs and searched > 1:
+                    # principal variation search: prove the move is no better
+                    val = -self._alphabeta(board, new_depth, -alpha - 1, -alpha, last_move=move)
+                    if alpha < val < beta:
+                        self.stats["pvs_researches"] += 1
+                        val = -self._alphabeta(board, new_depth, -beta, -alpha, last_move=move)
+                else:
+                    val = -self._alphabeta(board, new_depth, -beta, -alpha, last_move=move)
+            board.unmake_move()
 
             if val >= beta:
-                self.tt_best[pos_key(state)] = move
+                self.tt.store(board.key, depth_remaining, beta, LOWER, move)
 
-                if not is_capture(state, move):
-                    k1, k2 = self.killers.get(depth_remaining, [None, None])
-                    if move != k1:
-                        self.killers[depth_remaining] = [move, k1]
+                if not move & MOVE_CAPTURE:
+                    killers = self.killers
+                    k = 2 * min(len(board._undo), MAX_PLY - 1)
+                    if move != killers[k]:
+                        killers[k + 1] = killers[k]
+                        killers[k] = move
 
-                    f, t = move
-                    self.history[(state.side, f, t)] = self.history.get((state.side, f, t), 0) + (depth_remaining * depth_remaining)
+                    self._add_history((move & MOVE_SQUARES) + side_off, depth_remaining * depth_remaining)
 
                 if last_move is not None:
-                    self.counter_move[(last_move[0], last_move[1], state.side)] = move
+                    self.counter_move[(last_move & MOVE_SQUARES) + side_off] = move
 
                 return beta
 
@@ -371,42 +802,91 @@ class AlphaBetaAgent:
                 alpha = val
                 best_move_local = move
 
-                if not is_capture(state, move):
-                    f, t = move
-                    self.history[(state.side, f, t)] = self.history.get((state.side, f, t), 0) + depth_remaining
+                if not move & MOVE_CAPTURE:
+                    self._add_history((move & MOVE_SQUARES) + side_off, depth_remaining)
+
+        if searched == 0:
+            if pruned:
+                return alpha
+            # no legal moves
+            return self._static_eval(board)
 
         if best_move_local is not None:
-            self.tt_best[pos_key(state)] = best_move_local
+            self.tt.store(board.key, depth_remaining, alpha, EXACT, best_move_local)
+        else:
+            self.tt.store(board.key, depth_remaining, alpha, UPPER, None)
 
         return alpha
 
-    def _root_alphabeta(self, state, depth, alpha, beta, last_move=None):
+    def _root_alphabeta(self, board, depth, alpha, beta, last_move=None):
+        # (best move, score), fail-hard: when no move beats alpha the first
+        # one is returned with alpha (a fail low), (None, alpha) if no moves
         best_move = None
 
-        moves = generate_moves(state)
+        moves = generate_moves(board)
         if not moves:
             return None, alpha
 
         # 0) Fast win check (promotion / terminal in 1)
         for mv in moves:
-            nxt = apply_move(state, mv)
-            if is_terminal(nxt):
-                v = evaluate(nxt)
-                v = v if nxt.side == 'w' else -v
-                if v > 0:  # only pick if winning
-                    return mv, 1000000
-
-        moves = self._order_moves(state, moves, depth, last_move)
-
-        for move in moves:
-            next_state = apply_move(state, move)
-            val = -self._alphabeta(next_state, depth - 1, -beta, -alpha, last_move=move)
+            board.make_move(mv)
+            v = 0
+            if is_terminal(board):
+                v = self._static_eval(board)
+            board.unmake_move()
+            if v > 0:  # only pick if winning
+                return mv, 1000000
+
+        moves = list(self._pick_moves(board, last_move))
+        if self.root_shift and len(moves) > 2:
+            # parallel helpers: same first (hash) move, rotated tail
+            k = self.root_shift % (len(moves) - 1)
+            moves = moves[:1] + moves[1 + k:] + moves[1:1 + k]
+
+        if self._root_split is not None and depth >= ROOT_SPLIT_MIN_DEPTH and len(moves) > 1:
+            return self._root_split_search(board, moves, depth, alpha, beta, last_move)
+
+        for i, move in enumerate(moves):
+            board.make_move(move)
+            if self.pvs and i > 0:
+                val = -self._alphabeta(board, depth - 1, -alpha - 1, -alpha, last_move=move)
+                if alpha < val < beta:
+                    self.stats["pvs_researches"] += 1
+                    val = -self._alphabeta(board, depth - 1, -beta, -alpha, last_move=move)
+            else:
+                val = -self._alphabeta(board, depth - 1, -beta, -alpha, last_move=move)
+            board.unmake_move()
 
             if val > alpha:
                 alpha = val
                 best_move = move
 
-        if best_move is not None:
-            self.tt_best[pos_key(state)] = best_move
+        return self._root_result(board, moves, depth, alpha, best_move)
 
+    def _root_result(self, board, moves, depth, alpha, best_move):
+        if best_move is None:
+            # fail low: alpha is an upper bound, the hash move is kept
+            self.tt.store(board.key, depth, alpha, UPPER, None)
+            return moves[0], alpha
+        self.tt.store(board.key, depth, alpha, EXACT, best_move)
         return best_move, alpha
+
+    def _root_split_search(self, board, moves, depth, alpha, beta, last_move):
+        # PV move here for a bound, the rest in parallel with that window
+        best_move = None
+
+        first = moves[0]
+        board.make_move(first)
+        val = -self._alphabeta(board, depth - 1, -beta, -alpha, last_move=first)
+        board.unmake_move()
+        if val > alpha:
+            alpha = val
+            best_move = first
+
+        if alpha < beta:
+            for move, val in self._root_split.search_moves(board, moves[1:], depth, alpha, beta):
+                if val > alpha:
+                    alpha = val
+                    best_move = move
+
+        return self._root_result(board, moves, depth, alpha, best_move)
@@ -1,11 +1,13 @@
 from source_code_files.game.state import GameState
 
 from source_code_files.game.moves import generate_moves
+from source_code_files.game.zobrist import ZOBRIST_WHITE, ZOBRIST_BLACK, ZOBRIST_EP, ZOBRIST_SIDE
 
 
 def apply_move(state: GameState, move):
 
-    from_sq, to_sq = move
+    from_sq = move & 63
+    to_sq = (move >> 6) & 63
 
     from_mask = 1 << from_sq
     to_mask = 1 << to_sq
@@ -13,6 +15,12 @@ def apply_move(state: GameState, move):
     white = state.white
     black = state.black
     en_passant = None  # reset every move
+
+    # incremental Zobrist key: flip side, drop old en passant square
+    key = state.key ^ ZOBRIST_SIDE
+    if state.en_passant is not None:
+        key ^= ZOBRIST_EP[state.en_passant]
+
     if state.side == 'w':
         assert (white & from_mask) != 0, "White tried to move non-white piece"
     else:
@@ -28,22 +36,26 @@ def apply_move(state: GameState, move):
     # --------------------------------
     if state.side == 'w':
         white &= ~from_mask
+        key ^= ZOBRIST_WHITE[from_sq] ^ ZOBRIST_WHITE[to_sq]
 
         # Normal capture
         if to_mask & black:
             black &= ~to_mask
+            key ^= ZOBRIST_BLACK[to_sq]
 
         # En passant capture
         elif state.en_passant is not None and to_sq == state.en_passant:
             captured_sq = to_sq - 8
             assert (1 << captured_sq) & black, "Illegal en passant by white"
             black &= ~(1 << captured_sq)
+            key ^= ZOBRIST_BLACK[captured_sq]
 
         white |= to_mask
 
         # Double push enables en passant
         if to_sq - from_sq == 16:
             en_passant = from_sq + 8
+            key ^= ZOBRIST_EP[en_passant]
 
         next_side = 'b'
 
@@ -52,22 +64,26 @@ def apply_move(state: GameState, move):
     # --------------------------------
     else:
         black &= ~from_mask
+        key ^= ZOBRIST_BLACK[from_sq] ^ ZOBRIST_BLACK[to_sq]
 
         # Normal capture
         if to_mask & white:
             white &= ~to_mask
+            key ^= ZOBRIST_WHITE[to_sq]
 
         # En passant capture
         elif state.en_passant is not None and to_sq == state.en_passant:
             captured_sq = to_sq + 8
             assert (1 << captured_sq) & white, "Illegal en passant by black"
             white &= ~(1 << captured_sq)
+            key ^= ZOBRIST_WHITE[captured_sq]
 
         black |= to_mask
 
         # Double push enables en passant
         if from_sq - to_sq == 16:
             en_passant = from_sq - 8
+            key ^= ZOBRIST_EP[en_passant]
 
         next_side = 'w'
 
@@ -85,5 +101,6 @@ def apply_move(state: GameState, move):
         white=white,
         black=black,
         side=next_side,
-        en_passant=en_passant
+        en_passant=en_passant,
+        key=key
     )
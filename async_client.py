@@ -0,0 +1,238 @@
+import argparse
+import asyncio
+import contextlib
+import io
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from game.state import GameState
+from game.apply_move import apply_move
+from game.moves import move_to_str, str_to_move
+from agents.alphabeta_agent import AlphaBetaAgent
+from agents.transposition import TranspositionTable, shared_table
+from protocol import parse_message, SETUP, TIME, BEGIN, RESET, GAME_OVER, MOVE, EXIT, TOURNAMENT_ACCEPTED
+
+
+# ─────────────────────────────────────────────
+# Search processes
+# ─────────────────────────────────────────────
+
+_agent = None
+_game = None    # game of the agent's last search
+
+
+def _init_search_process(depth, tt_bits, shm):
+    """One warm agent per process; with shm its table is the shared (global) one."""
+    global _agent
+    _agent = AlphaBetaAgent(depth=depth, tt_bits=0 if shm is not None else tt_bits)
+    if shm is not None:
+        _agent.tt = TranspositionTable(tt_bits, shm.buf)
+
+
+def _search(job):
+    """
+    (white, black, side, en_passant, last_move, time_left, submitted, game, moves_played)
+    -> (move, time_left after). game identifies the connection's current game: a
+    process may serve several games, so the move ordering is reset when it changes
+    and the time manager gets the game's own move count.
+    """
+    global _game
+    white, black, side, en_passant, last_move, time_left, submitted, game, moves_played = job
+    state = GameState(white=white, black=black, side=side, en_passant=en_passant)
+    if game != _game:
+        _agent.new_game()
+        _game = game
+    _agent.moves_played = moves_played
+    # time spent queued behind other connections' searches is on our clock too
+    _agent.set_time_left(time_left - (time.monotonic() - submitted))
+    with contextlib.redirect_stdout(io.StringIO()):
+        move = _agent.choose_move(state, last_move)
+    return move, _agent.get_time_left()
+
+
+# ─────────────────────────────────────────────
+# One server connection
+# ─────────────────────────────────────────────
+
+class Player:
+    """
+    Plays the client.py protocol on one connection; searches run in
+    `pool` so the event loop keeps serving the other connections.
+    """
+
+    def __init__(self, host, port, side, pool, quiet=False):
+        self.host = host
+        self.port = port
+        self.side = side
+        self.pool = pool
+        self.quiet = quiet
+        self.name = f"{host}:{port}:{side}"
+        self.writer = None
+        self.reader = None
+        # number of the current game and our moves in it, sent with every search
+        self.game = 0
+        self.moves_played = 0
+
+    def log(self, text):
+        if not self.quiet:
+            print(f"[{self.name}] {text}")
+
+    async def send(self, msg):
+        self.writer.write((msg + "\n").encode())
+        await self.writer.drain()
+        self.log(f">>> {msg}")
+
+    async def recv(self):
+        line = await self.reader.readline()
+        if not line:
+            raise ConnectionError("Server closed connection")
+        msg = parse_message(line.decode().strip())
+        self.log(f"<<< {msg.text}")
+        return msg
+
+    async def expect(self, kind):
+        msg = await self.recv()
+        if msg.kind != kind:
+            raise RuntimeError(f"Expected {kind}, got {msg.text}")
+        return msg
+
+    def new_game(self):
+        self.game += 1
+        self.moves_played = 0
+
+    async def think(self, state, last_move, time_left):
+        loop = asyncio.get_running_loop()
+        job = (state.white, state.black, state.side, state.en_passant, last_move, time_left, time.monotonic(),
+               (self.name, self.game), self.moves_played)
+        return await loop.run_in_executor(self.pool, _search, job)
+
+    async def run(self):
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        self.log("[connected]")
+
+        await self.send("OK")
+        initial_state = (await self.expect(SETUP)).state
+        await self.send("OK")
+        minutes = (await self.expect(TIME)).minutes
+        await self.send("OK")
+
+        state = initial_state
+        last_move = None
+        time_left = minutes * 60.0
+        my_turn = False
+        self.new_game()
+
+        while True:
+            msg = await self.recv()
+
+            if msg.kind == TOURNAMENT_ACCEPTED or msg.kind == GAME_OVER:
+                continue
+            if msg.kind == EXIT:
+                break
+
+            if msg.kind == RESET:
+                await self.send("Ready")
+                state = initial_state
+                last_move = None
+                time_left = minutes * 60.0
+                self.new_game()
+                continue
+
+            if msg.kind == SETUP:
+                initial_state = msg.state
+                await self.send("OK")
+                minutes = (await self.expect(TIME)).minutes
+                await self.send("OK")
+                state = initial_state
+                last_move = None
+                time_left = minutes * 60.0
+                self.new_game()
+                continue
+
+            if msg.kind == BEGIN:
+                my_turn = True
+            elif msg.kind == MOVE:
+                last_move = str_to_move(state, msg.move)
+                state = apply_move(state, last_move)
+                my_turn = True
+
+            if my_turn:
+                move, time_left = await self.think(state, last_move, time_left)
+                if move is None:
+                    await self.send("exit")   # resignation
+                    break
+                await self.send(move_to_str(move))
+                state = apply_move(state, move)
+                last_move = move
+                self.moves_played += 1
+                my_turn = False
+
+        self.writer.close()
+        await self.writer.wait_closed()
+        self.log("[done]")
+
+
+# ─────────────────────────────────────────────
+# Main
+# ─────────────────────────────────────────────
+
+def parse_conn(text):
+    host, port, side = text.rsplit(":", 2)
+    if side not in ("w", "b"):
+        raise argparse.ArgumentTypeError(f"side must be w or b: {text}")
+    return host, int(port), side
+
+
+async def play_all(args):
+    pools = []
+    shm = None
+
+    if args.tables == "global":
+        # one pool, every process on the same shared-memory table
+        shm, table = shared_table(args.tt_bits)
+        table.release()     # this process does not search
+        pool = ProcessPoolExecutor(max_workers=args.workers, initializer=_init_search_process,
+                                   initargs=(args.depth, args.tt_bits, shm))
+        pools.append(pool)
+        players = [Player(h, p, s, pool, args.quiet) for h, p, s in args.conn]
+    else:
+        # one single-process pool per connection: private, warm tables
+        players = []
+        for h, p, s in args.conn:
+            pool = ProcessPoolExecutor(max_workers=1, initializer=_init_search_process,
+                                       initargs=(args.depth, args.tt_bits, None))
+            pools.append(pool)
+            players.append(Player(h, p, s, pool, args.quiet))
+
+    try:
+        results = await asyncio.gather(*(p.run() for p in players), return_exceptions=True)
+        for p, r in zip(players, results):
+            if isinstance(r, Exception):
+                print(f"[{p.name}] error: {r!r}")
+    finally:
+        for pool in pools:
+            pool.shutdown(cancel_futures=True)
+        if shm is not None:
+            shm.close()
+            shm.unlink()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play several server connections from one process")
+    parser.add_argument("--conn", type=parse_conn, action="append", required=True,
+                        metavar="HOST:PORT:SIDE", help="connection, may be repeated")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="search processes with --tables global (default: all cores)")
+    parser.add_argument("--tables", choices=["connection", "global"], default="connection",
+                        help="connection: one agent / table per connection, "
+                             "global: one shared-memory table for all searches")
+    parser.add_argument("--depth", type=int, default=None, help="maximum search depth (default: time-bounded)")
+    parser.add_argument("--tt-bits", type=int, default=20)
+    parser.add_argument("--quiet", action="store_true", help="do not print protocol lines")
+    args = parser.parse_args()
+
+    asyncio.run(play_all(args))
+
+
+if __name__ == "__main__":
+    main()
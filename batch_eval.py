@@ -0,0 +1,215 @@
+import numpy as np
+
+from source_code_files.game.moves import (
+    NOT_A_FILE, NOT_H_FILE, RANK_2, RANK_7, WHITE_PAWN_ATTACKS, BLACK_PAWN_ATTACKS,
+    MOVE_CAPTURE, MOVE_DOUBLE, MOVE_EP,
+)
+from source_code_files.game.evaluation import (
+    W_MATERIAL, W_ADVANCE, W_MOBILITY, W_PASSED, W_THREAT, RANK_MASKS, PROMO_WHITE, PROMO_BLACK,
+)
+
+# -------------------------
+# Batched evaluation / move counting
+# -------------------------
+# Every function takes equal-length NumPy arrays: white / black as uint64
+# bitboards, en_passant as int (-1 = none), side as bool (True = White to
+# move), and works on the whole batch with shifts, masks and popcounts.
+# Results equal evaluation.evaluate / len(generate_moves) position by
+# position (eval_check.py --batch checks it).
+
+_U = np.uint64
+_NOT_A = _U(NOT_A_FILE)
+_NOT_H = _U(NOT_H_FILE)
+_RANK_2 = _U(RANK_2)
+_RANK_7 = _U(RANK_7)
+_RANKS = [_U(m) for m in RANK_MASKS]
+_PROMO_WHITE = _U(PROMO_WHITE)
+_PROMO_BLACK = _U(PROMO_BLACK)
+_ZERO = _U(0)
+
+# attack tables with a 65th all-empty entry for "no en passant square"
+_WHITE_ATTACKS = np.array(WHITE_PAWN_ATTACKS + [0], dtype=np.uint64)
+_BLACK_ATTACKS = np.array(BLACK_PAWN_ATTACKS + [0], dtype=np.uint64)
+
+_M1 = _U(0x5555555555555555)
+_M2 = _U(0x3333333333333333)
+_M4 = _U(0x0F0F0F0F0F0F0F0F)
+_H01 = _U(0x0101010101010101)
+
+
+def _popcount_swar(bb):
+    # for NumPy < 2.0 (no bitwise_count)
+    bb = bb - ((bb >> _U(1)) & _M1)
+    bb = (bb & _M2) + ((bb >> _U(2)) & _M2)
+    bb = (bb + (bb >> _U(4))) & _M4
+    return ((bb * _H01) >> _U(56)).astype(np.int64)
+
+
+def _popcount_native(bb):
+    return np.bitwise_count(bb).astype(np.int64)
+
+
+popcount = _popcount_native if hasattr(np, "bitwise_count") else _popcount_swar
+
+
+def from_states(states):
+    """(white, black, side, en_passant) arrays from GameState-like objects."""
+    white = np.fromiter((s.white for s in states), dtype=np.uint64)
+    black = np.fromiter((s.black for s in states), dtype=np.uint64)
+    side = np.fromiter((s.side == 'w' for s in states), dtype=bool)
+    en_passant = np.fromiter((-1 if s.en_passant is None else s.en_passant for s in states), dtype=np.int64)
+    return white, black, side, en_passant
+
+
+# -------------------------
+# Set-wise helpers (same as evaluation.py, on arrays)
+# -------------------------
+def _south_fill(bb):
+    bb = bb | (bb >> _U(8))
+    bb = bb | (bb >> _U(16))
+    return bb | (bb >> _U(32))
+
+
+def _north_fill(bb):
+    # uint64 shifts drop the bits pushed past the top, like & FULL_BOARD
+    bb = bb | (bb << _U(8))
+    bb = bb | (bb << _U(16))
+    return bb | (bb << _U(32))
+
+
+def _spread(bb):
+    return bb | ((bb & _NOT_A) >> _U(1)) | ((bb & _NOT_H) << _U(1))
+
+
+def passed_white(white, black):
+    return white & ~_spread(_south_fill(black >> _U(8)))
+
+
+def passed_black(white, black):
+    return black & ~_spread(_north_fill(white << _U(8)))
+
+
+def pawn_advancement(white, black):
+    value = np.zeros(white.shape, dtype=np.int64)
+    for r in range(1, 8):
+        value += r * popcount(white & _RANKS[r])
+    for r in range(7):
+        value -= (7 - r) * popcount(black & _RANKS[r])
+    return value
+
+
+# -------------------------
+# Move targets (the generators' bitboards, before the square loops)
+# -------------------------
+def white_targets(white, black):
+    """(single, double, capture left, capture right) target bitboards of White."""
+    empty = ~(white | black)
+    single = (white << _U(8)) & empty
+    double = ((((white & _RANK_2) << _U(8)) & empty) << _U(8)) & empty
+    left = ((white & _NOT_A) << _U(7)) & black
+    right = ((white & _NOT_H) << _U(9)) & black
+    return single, double, left, right
+
+
+def black_targets(white, black):
+    empty = ~(white | black)
+    single = (black >> _U(8)) & empty
+    double = ((((black & _RANK_7) >> _U(8)) & empty) >> _U(8)) & empty
+    right = ((black & _NOT_H) >> _U(7)) & white
+    left = ((black & _NOT_A) >> _U(9)) & white
+    return single, double, right, left
+
+
+def ep_captures(white, black, en_passant):
+    """(white, black) en passant capture counts, as generate_*_captures would find them."""
+    ep = np.where(en_passant >= 0, en_passant, 64)
+    rank = ep // 8
+    w = np.where(rank == 5, popcount(white & _BLACK_ATTACKS[ep]), 0)
+    b = np.where(rank == 2, popcount(black & _WHITE_ATTACKS[ep]), 0)
+    return w, b
+
+
+def move_counts(white, black, en_passant):
+    """
+    Per position: (white moves, black moves, white captures, black captures),
+    i.e. len(generate_white_moves), len(generate_black_moves) and their
+    non-en-passant captures.
+    """
+    ws, wd, wl, wr = white_targets(white, black)
+    bs, bd, br, bl = black_targets(white, black)
+    w_caps = popcount(wl) + popcount(wr)
+    b_caps = popcount(br) + popcount(bl)
+    w_ep, b_ep = ep_captures(white, black, en_passant)
+    w_moves = popcount(ws) + popcount(wd) + w_caps + w_ep
+    b_moves = popcount(bs) + popcount(bd) + b_caps + b_ep
+    return w_moves, b_moves, w_caps, b_caps
+
+
+def count_moves(white, black, side, en_passant):
+    """len(generate_moves(state)) for every position."""
+    w_moves, b_moves, _, _ = move_counts(white, black, en_passant)
+    return np.where(side, w_moves, b_moves)
+
+
+# -------------------------
+# Evaluation
+# -------------------------
+def evaluate(white, black, en_passant=None):
+    """evaluation.evaluate for every position (White's point of view), int64."""
+    if en_passant is None:
+        en_passant = np.full(white.shape, -1, dtype=np.int64)
+
+    w_moves, b_moves, w_caps, b_caps = move_counts(white, black, en_passant)
+    score = W_MATERIAL * (popcount(white) - popcount(black))
+    score += W_ADVANCE * pawn_advancement(white, black)
+    score += W_MOBILITY * (w_moves - b_moves)
+    score += W_THREAT * (w_caps - b_caps)
+    score += W_PASSED * (popcount(passed_white(white, black)) - popcount(passed_black(white, black)))
+
+    # terminal positions, in evaluate's order of checks
+    return np.select(
+        [white == _ZERO, black == _ZERO, (white & _PROMO_WHITE) != _ZERO, (black & _PROMO_BLACK) != _ZERO],
+        [-10_000, 10_000, 10_000, -10_000],
+        score,
+    )
+
+
+def evaluate_states(states):
+    """evaluate over a list of GameState / Board objects, as a NumPy int64 array."""
+    white, black, _, en_passant = from_states(states)
+    return evaluate(white, black, en_passant)
+
+
+# -------------------------
+# Move lists
+# -------------------------
+def children(state, moves):
+    """(white, black, en_passant) arrays of the positions after each packed move of state."""
+    m = np.asarray(moves, dtype=np.int64)
+    one = _U(1)
+    from_bb = one << (m & 63).astype(np.uint64)
+    to_sq = (m >> 6) & 63
+    to_bb = one << to_sq.astype(np.uint64)
+    capture = (m & MOVE_CAPTURE) != 0
+    double = (m & MOVE_DOUBLE) != 0
+
+    white = np.full(m.shape, state.white, dtype=np.uint64)
+    black = np.full(m.shape, state.black, dtype=np.uint64)
+    if state.side == 'w':
+        captured = np.where((m & MOVE_EP) != 0, to_sq - 8, to_sq)
+        black = np.where(capture, black & ~(one << captured.astype(np.uint64)), black)
+        white = (white & ~from_bb) | to_bb
+        en_passant = np.where(double, (m & 63) + 8, -1)
+    else:
+        captured = np.where((m & MOVE_EP) != 0, to_sq + 8, to_sq)
+        white = np.where(capture, white & ~(one << captured.astype(np.uint64)), white)
+        black = (black & ~from_bb) | to_bb
+        en_passant = np.where(double, (m & 63) - 8, -1)
+    return white, black, en_passant
+
+
+def evaluate_moves(state, moves):
+    """evaluate() of the position after each move, from the mover's point of view."""
+    white, black, en_passant = children(state, moves)
+    scores = evaluate(white, black, en_passant)
+    return scores if state.side == 'w' else -scores
@@ -0,0 +1,191 @@
+import argparse
+import contextlib
+import io
+import json
+import platform
+import sys
+import time
+
+from protocol import setup_to_state
+from game.moves import move_to_str
+from agents.alphabeta_agent import AlphaBetaAgent
+
+
+# ─────────────────────────────────────────────
+# Fixed benchmark positions (White to move)
+# ─────────────────────────────────────────────
+
+POSITIONS = [
+    # openings
+    ("open-start",     "Wa2 Wb2 Wc2 Wd2 We2 Wf2 Wg2 Wh2 Ba7 Bb7 Bc7 Bd7 Be7 Bf7 Bg7 Bh7"),
+    ("open-e4d5",      "Wa2 Wb2 Wc2 Wd2 We4 Wf2 Wg2 Wh2 Ba7 Bb7 Bc7 Bd5 Be7 Bf7 Bg7 Bh7"),
+    ("open-flank",     "Wa4 Wb2 Wc2 Wd2 We2 Wf2 Wg2 Wh4 Ba5 Bb7 Bc7 Bd7 Be7 Bf7 Bg7 Bh5"),
+    # middlegames
+    ("mid-tension",    "Wa2 Wb2 Wc4 Wd5 Wf2 Wg3 Wh2 Ba7 Bb6 Bc5 Be6 Bf7 Bg7 Bh7"),
+    ("mid-center",     "Wa3 Wb4 Wc3 Wd4 We3 Wg2 Wh3 Ba6 Bb5 Bc6 Bd5 Be6 Bf7 Bh6"),
+    # races
+    ("race-2v2",       "Wa4 Wb2 Bg5 Bh7"),
+    ("race-outside",   "Wa4 We4 Wh2 Bb7 Bf6 Bh7"),
+    ("race-promo",     "Wa6 Wb2 Bh3 Bg7"),
+    # blocked structures
+    ("blocked-chain",  "Wc5 Wd4 Wa2 Bc6 Bd5 Bh7"),
+    ("blocked-wall",   "Wa4 Wb4 Wc4 Wd4 We2 Wg3 Ba5 Bb5 Bc5 Bd5 Bf7 Bg4"),
+]
+
+
+def effective_branching_factor(iterations):
+    # geometric mean growth of main-search nodes between completed iterations
+    per_iter = []
+    prev = 0
+    for it in iterations:
+        per_iter.append(it["nodes"] - prev)
+        prev = it["nodes"]
+    if len(per_iter) < 2 or per_iter[0] <= 0:
+        return None
+    return round((per_iter[-1] / per_iter[0]) ** (1 / (len(per_iter) - 1)), 3)
+
+
+def run_position(setup, depth, max_nodes, agent_args):
+    state = setup_to_state("Setup " + setup)
+    agent = AlphaBetaAgent(depth=depth, max_nodes=max_nodes, **agent_args)
+    agent.start_workers()
+
+    t0 = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        move = agent.choose_move(state)
+    secs = time.perf_counter() - t0
+    agent.close()
+
+    total = agent.nodes + agent.qnodes
+    its = agent.iterations
+    return {
+        "setup": setup,
+        "move": move_to_str(move) if move is not None else None,
+        "score": its[-1]["score"] if its else None,
+        "depth": its[-1]["depth"] if its else 0,
+        "nodes": agent.nodes,
+        "qnodes": agent.qnodes,
+        "helper_nodes": agent.helper_nodes,
+        "time": round(secs, 4),
+        "nps": int(total / secs) if secs > 0 else 0,
+        "time_to_depth": {str(it["depth"]): round(it["time"], 4) for it in its},
+        "ebf": effective_branching_factor(its),
+        "stats": dict(agent.stats),
+    }
+
+
+def compare(results, baseline, threshold):
+    """Print a per-position comparison, return the number of flagged positions."""
+    flagged = 0
+    print(f"\n{'position':<16}{'nodes':>10}{'base':>10}{'nps':>10}{'base':>10}  flags")
+    for name, cur in results["positions"].items():
+        base = baseline["positions"].get(name)
+        if base is None:
+            print(f"{name:<16} (not in baseline)")
+            continue
+
+        flags = []
+        if cur["move"] != base["move"]:
+            flags.append(f"MOVE {base['move']}->{cur['move']}")
+        if base["nps"] and cur["nps"] < base["nps"] * (1 - threshold):
+            flags.append("SLOWER")
+        if base["nodes"] and cur["nodes"] > base["nodes"] * (1 + threshold):
+            flags.append("MORE NODES")
+        if flags:
+            flagged += 1
+
+        print(f"{name:<16}{cur['nodes']:>10}{base['nodes']:>10}{cur['nps']:>10}{base['nps']:>10}  {' '.join(flags)}")
+
+    return flagged
+
+
+def speedup(positions, depth, max_nodes, worker_counts, parallel="smp", agent_args=None):
+    """Time the whole position set for each worker count."""
+    runs = {}
+    for n in worker_counts:
+        secs = 0.0
+        nodes = 0
+        moves = {}
+        for name, setup in positions:
+            r = run_position(setup, depth, max_nodes, {**(agent_args or {}), "workers": n, "parallel": parallel})
+            secs += r["time"]
+            nodes += r["nodes"] + r["qnodes"] + r["helper_nodes"]
+            moves[name] = r["move"]
+        runs[str(n)] = {"time": round(secs, 4), "nodes": nodes, "moves": moves}
+
+    base = runs[str(worker_counts[0])]["time"]
+    print(f"\n{'workers':<10}{'time':>10}{'speedup':>10}{'nodes':>12}")
+    for n, run in runs.items():
+        run["speedup"] = round(base / run["time"], 3) if run["time"] > 0 else None
+        print(f"{n:<10}{run['time']:>10.3f}{run['speedup']:>10}{run['nodes']:>12}")
+    return runs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Search benchmark for AlphaBetaAgent.choose_move")
+    parser.add_argument("--depth", type=int, default=5, help="fixed search depth")
+    parser.add_argument("--nodes", type=int, default=None, help="node budget (nodes + qnodes) instead of depth")
+    parser.add_argument("--only", action="append", help="run only these positions (by name)")
+    parser.add_argument("--out", default="bench.json", help="where to write the results")
+    parser.add_argument("--compare", metavar="BASELINE", help="baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="relative change that gets flagged")
+    parser.add_argument("--workers", metavar="N,N,...",
+                        help="speedup mode: time the set for each worker count, e.g. 1,2,4")
+    parser.add_argument("--parallel", choices=["smp", "root"], default="smp",
+                        help="parallel search used in speedup mode")
+    parser.add_argument("--agent", default="{}",
+                        help="JSON kwargs of AlphaBetaAgent, e.g. '{\"lmr\": false}' for A/B runs")
+    args = parser.parse_args()
+
+    depth = 64 if args.nodes is not None else args.depth
+    agent_args = json.loads(args.agent)
+    positions = [(name, setup) for name, setup in POSITIONS if not args.only or name in args.only]
+
+    results = {
+        "meta": {
+            "depth": None if args.nodes is not None else args.depth,
+            "nodes": args.nodes,
+            "agent": agent_args,
+            "python": platform.python_version(),
+            "date": time.strftime("%Y-%m-%d %H:%M:%S"),
+        },
+        "positions": {},
+    }
+
+    if args.workers:
+        counts = [int(n) for n in args.workers.split(",")]
+        results["meta"]["parallel"] = args.parallel
+        results["speedup"] = speedup(positions, depth, args.nodes, counts, args.parallel, agent_args)
+        with open(args.out, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"results written to {args.out}")
+        return
+
+    totals = [0, 0.0]
+    for name, setup in positions:
+        r = run_position(setup, depth, args.nodes, agent_args)
+        results["positions"][name] = r
+        totals[0] += r["nodes"] + r["qnodes"]
+        totals[1] += r["time"]
+        print(f"{name:<16} move = {r['move']} | score = {r['score']} | depth = {r['depth']} | "
+              f"nodes = {r['nodes']} | qnodes = {r['qnodes']} | nps = {r['nps']} | ebf = {r['ebf']}")
+
+    nps = int(totals[0] / totals[1]) if totals[1] > 0 else 0
+    print(f"\ntotal nodes = {totals[0]} | time = {totals[1]:.2f}s | nps = {nps}")
+
+    with open(args.out, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"results written to {args.out}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if (baseline["meta"]["depth"], baseline["meta"]["nodes"]) != (results["meta"]["depth"], results["meta"]["nodes"]):
+            print("\nwarning: baseline was run with a different depth / node budget")
+        flagged = compare(results, baseline, args.threshold)
+        print(f"\n{flagged} position(s) flagged")
+        sys.exit(1 if flagged else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+from source_code_files.game.state import GameState
+from source_code_files.game.moves import MOVE_CAPTURE, MOVE_DOUBLE, MOVE_EP
+from source_code_files.game.zobrist import ZOBRIST_WHITE, ZOBRIST_BLACK, ZOBRIST_EP, ZOBRIST_SIDE
+from source_code_files.game.evaluation import (
+    W_MATERIAL, W_ADVANCE, W_MOBILITY, W_PASSED, W_THREAT,
+    PROMO_WHITE, PROMO_BLACK, ADJACENT_FILES,
+    pawn_advancement, passed_white, passed_black, mobility_threats, ep_mobility,
+)
+
+
+class Board:
+    """
+    Mutable position used by the search.
+
+    make_move / unmake_move change the board in place and keep an undo
+    stack, so the search does not allocate a GameState per node.
+    Has the same fields as GameState, so moves / evaluation / terminal
+    accept it unchanged. No legality checks: moves must be packed moves
+    from the move generator (flags are trusted).
+
+    Also carries an evaluation accumulator:
+      base      W_MATERIAL * material + W_ADVANCE * advancement (deltas per move)
+      passed_w  bitboard of passed white pawns
+      passed_b  bitboard of passed black pawns
+    Passed status is only recomputed on the files next to the moved /
+    captured pawn. evaluate() must always equal evaluation.evaluate().
+    """
+
+    __slots__ = ("white", "black", "side", "en_passant", "key",
+                 "base", "passed_w", "passed_b", "_undo")
+
+    def __init__(self, white, black, side, en_passant, key):
+        self.white = white
+        self.black = black
+        self.side = side
+        self.en_passant = en_passant
+        self.key = key
+        self._undo = []
+
+        self.base = W_MATERIAL * (white.bit_count() - black.bit_count()) + W_ADVANCE * pawn_advancement(self)
+        self.passed_w = passed_white(white, black)
+        self.passed_b = passed_black(white, black)
+
+    @classmethod
+    def from_state(cls, state: GameState):
+        return cls(state.white, state.black, state.side, state.en_passant, state.key)
+
+    def to_state(self) -> GameState:
+        return GameState(
+            white=self.white,
+            black=self.black,
+            side=self.side,
+            en_passant=self.en_passant,
+            key=self.key
+        )
+
+    def evaluate(self, cache=None):
+        # same result as evaluation.evaluate(self), White's point of view;
+        # cache: optional eval_cache.EvalCache for the structure part
+        white = self.white
+        black = self.black
+
+        if white == 0:
+            return -10_000
+        if black == 0:
+            return 10_000
+        if white & PROMO_WHITE:
+            return 10_000
+        if black & PROMO_BLACK:
+            return -10_000
+
+        s = self.structure_score() if cache is None else cache.structure_score(self)
+        if self.en_passant is not None:
+            s += W_MOBILITY * ep_mobility(white, black, self.en_passant)
+        return s
+
+    def structure_score(self):
+        # the evaluation without en passant: a function of (white, black) only
+        mobility, threats = mobility_threats(self.white, self.black, None)
+        return (
+            self.base
+            + W_PASSED * (self.passed_w.bit_count() - self.passed_b.bit_count())
+            + W_MOBILITY * mobility
+            + W_THREAT * threats
+        )
+
+    def pawn_key(self):
+        # Zobrist key of the pawns alone (side to move and en passant removed)
+        key = self.key
+        if self.side == 'b':
+            key ^= ZOBRIST_SIDE
+        if self.en_passant is not None:
+            key ^= ZOBRIST_EP[self.en_passant]
+        return key
+
+    def make_move(self, move):
+        # packed move from the generator: flags say capture / en passant / double push
+        from_sq = move & 63
+        to_sq = (move >> 6) & 63
+        ep = self.en_passant
+
+        key = self.key ^ ZOBRIST_SIDE
+        if ep is not None:
+            key ^= ZOBRIST_EP[ep]
+
+        captured_sq = -1
+        base = self.base
+
+        if self.side == 'w':
+            if move & MOVE_CAPTURE:
+                captured_sq = to_sq - 8 if move & MOVE_EP else to_sq
+                self.black &= ~(1 << captured_sq)
+                key ^= ZOBRIST_BLACK[captured_sq]
+                # black pawn gone: its material and its -(7 - row) advancement
+                base += W_MATERIAL + W_ADVANCE * (7 - (captured_sq >> 3))
+
+            self.white = (self.white & ~(1 << from_sq)) | (1 << to_sq)
+            key ^= ZOBRIST_WHITE[from_sq] ^ ZOBRIST_WHITE[to_sq]
+            base += W_ADVANCE * ((to_sq >> 3) - (from_sq >> 3))
+
+            if move & MOVE_DOUBLE:
+                self.en_passant = from_sq + 8
+                key ^= ZOBRIST_EP[from_sq + 8]
+            else:
+                self.en_passant = None
+            self.side = 'b'
+        else:
+            if move & MOVE_CAPTURE:
+                captured_sq = to_sq + 8 if move & MOVE_EP else to_sq
+                self.white &= ~(1 << captured_sq)
+                key ^= ZOBRIST_WHITE[captured_sq]
+                base -= W_MATERIAL + W_ADVANCE * (captured_sq >> 3)
+
+            self.black = (self.black & ~(1 << from_sq)) | (1 << to_sq)
+            key ^= ZOBRIST_BLACK[from_sq] ^ ZOBRIST_BLACK[to_sq]
+            base -= W_ADVANCE * ((from_sq >> 3) - (to_sq >> 3))
+
+            if move & MOVE_DOUBLE:
+                self.en_passant = from_sq - 8
+                key ^= ZOBRIST_EP[from_sq - 8]
+            else:
+                self.en_passant = None
+            self.side = 'w'
+
+        self._undo.append((from_sq, to_sq, captured_sq, ep, self.key, self.base, self.passed_w, self.passed_b))
+        self.key = key
+        self.base = base
+
+        # passed pawns: only the files next to from / to (a captured pawn sits on the to file)
+        region = ADJACENT_FILES[from_sq & 7] | ADJACENT_FILES[to_sq & 7]
+        white = self.white
+        black = self.black
+        self.passed_w = (self.passed_w & ~region) | passed_white(white & region, black)
+        self.passed_b = (self.passed_b & ~region) | passed_black(white, black & region)
+
+    def unmake_move(self):
+        from_sq, to_sq, captured_sq, ep, key, base, passed_w, passed_b = self._undo.pop()
+        move_mask = (1 << from_sq) | (1 << to_sq)
+
+        if self.side == 'b':
+            # white made the move
+            self.white ^= move_mask
+            if captured_sq >= 0:
+                self.black |= 1 << captured_sq
+            self.side = 'w'
+        else:
+            self.black ^= move_mask
+            if captured_sq >= 0:
+                self.white |= 1 << captured_sq
+            self.side = 'b'
+
+        self.en_passant = ep
+        self.key = key
+        self.base = base
+        self.passed_w = passed_w
+        self.passed_b = passed_b
@@ -0,0 +1,125 @@
+# agents/book.py
+import mmap
+import random
+import struct
+
+from source_code_files.game.apply_move import apply_move
+from source_code_files.game.moves import generate_moves
+
+# -------------------------
+# File format
+# -------------------------
+#   header   magic, number of records (HEADER)
+#   records  sorted by (key, -games), RECORD each:
+#              key     Zobrist key of the position before the move
+#              move    packed move (see moves.py)
+#              games   games in which the move was played
+#              points  2 * wins + draws for the side that played it
+MAGIC = b"PBK1"
+HEADER = struct.Struct("<4sxxxxQ")
+RECORD = struct.Struct("<QHII")
+
+BEST = "best"
+WEIGHTED = "weighted"
+
+
+# -------------------------
+# Building
+# -------------------------
+def build_book(games, max_plies=16, min_games=2):
+    """
+    games: iterable of (start_state, [packed moves], winner) with winner
+    'w', 'b' or None (draw). Returns the sorted record tuples
+    (key, move, games, points) of every move played in the first
+    max_plies plies of at least min_games games.
+    """
+    stats = {}
+    for start, moves, winner in games:
+        state = start
+        for mv in moves[:max_plies]:
+            if winner is None:
+                points = 1
+            else:
+                points = 2 if winner == state.side else 0
+            entry = stats.setdefault((state.key, mv), [0, 0])
+            entry[0] += 1
+            entry[1] += points
+            state = apply_move(state, mv)
+
+    records = [(key, mv, n, pts) for (key, mv), (n, pts) in stats.items() if n >= min_games]
+    records.sort(key=lambda r: (r[0], -r[2], r[1]))
+    return records
+
+
+def write_book(path, records):
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, len(records)))
+        for r in records:
+            f.write(RECORD.pack(*r))
+
+
+# -------------------------
+# Probing
+# -------------------------
+class Book:
+    """
+    Memory-mapped book file; lookups binary-search the sorted records.
+
+    mode BEST plays the move with the highest smoothed score,
+    WEIGHTED picks at random with probability ~ games * smoothed score.
+    """
+
+    def __init__(self, path, mode=BEST, seed=None):
+        if mode not in (BEST, WEIGHTED):
+            raise ValueError(f"unknown book mode {mode!r}")
+        self.path = path
+        self.mode = mode
+        self.rng = random.Random(seed)
+
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.size = HEADER.unpack_from(self._mm)
+        if magic != MAGIC or len(self._mm) != HEADER.size + self.size * RECORD.size:
+            raise ValueError(f"bad book file {path}")
+
+    def _key_at(self, i):
+        return RECORD.unpack_from(self._mm, HEADER.size + i * RECORD.size)[0]
+
+    def entries(self, key):
+        """[(move, games, points)] stored for a position key."""
+        lo, hi = 0, self.size
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._key_at(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+
+        out = []
+        for i in range(lo, self.size):
+            k, move, games, points = RECORD.unpack_from(self._mm, HEADER.size + i * RECORD.size)
+            if k != key:
+                break
+            out.append((move, games, points))
+        return out
+
+    def choose(self, state):
+        """Book move for the position, or None. Moves the generator does not produce are ignored."""
+        entries = self.entries(state.key)
+        if not entries:
+            return None
+
+        legal = set(generate_moves(state))
+        entries = [e for e in entries if e[0] in legal]
+        if not entries:
+            return None
+
+        # Laplace-smoothed score in [0, 1]: a single won game is not a 100% move
+        def score(e):
+            return (e[2] + 1) / (2 * e[1] + 2)
+
+        if self.mode == BEST:
+            return max(entries, key=lambda e: (score(e), e[1]))[0]
+
+        weights = [e[1] * score(e) for e in entries]
+        return self.rng.choices(entries, weights=weights)[0][0]
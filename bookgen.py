@@ -0,0 +1,108 @@
+import argparse
+import re
+
+from game.apply_move import apply_move
+from game.moves import str_to_move
+from game.terminal import winner
+from agents.book import build_book, write_book
+from protocol import setup_to_state
+from play_local import DEFAULT_SETUP
+
+
+MOVE_TEXT = re.compile(r"^[a-h][1-8][a-h][1-8]$")
+RESULTS = {"1-0": 'w', "0-1": 'b', "1/2-1/2": None, "1/2": None}
+
+
+# ─────────────────────────────────────────────
+# Game files
+# ─────────────────────────────────────────────
+
+def read_games(lines, start):
+    """
+    Yields (start_state, [packed moves], winner) from text lines.
+
+    Two formats are accepted:
+      book format  one game per line: "a2a4 h7h5 ... [1-0|0-1|1/2-1/2]";
+                   a "Setup ..." line sets the start position of the
+                   following games, '#' starts a comment
+      client logs  the ">>> msg" / "<<< msg" lines printed by client.py;
+                   a game ends at GameOver / Reset / exit
+    Without a result token the winner is read from the final position
+    (None = draw / unknown).
+    """
+    log_state = None
+    log_moves = []
+
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+
+        # ── client log
+        if line.startswith(">>> ") or line.startswith("<<< "):
+            msg = line[4:].strip()
+            if msg.startswith("Setup"):
+                start = setup_to_state(msg)
+                log_state = start
+                log_moves = []
+            elif msg.startswith("GameOver") or msg in ("Reset", "exit"):
+                if log_moves:
+                    yield start, log_moves, winner(log_state)
+                log_state = start
+                log_moves = []
+            elif MOVE_TEXT.match(msg):
+                if log_state is None:
+                    log_state = start
+                mv = str_to_move(log_state, msg)
+                log_state = apply_move(log_state, mv)
+                log_moves.append(mv)
+            continue
+
+        # ── book format
+        if line.startswith("Setup"):
+            start = setup_to_state(line)
+            continue
+
+        state = start
+        moves = []
+        result = None
+        has_result = False
+        for tok in line.split():
+            if tok in RESULTS:
+                result = RESULTS[tok]
+                has_result = True
+                break
+            mv = str_to_move(state, tok)
+            state = apply_move(state, mv)
+            moves.append(mv)
+        if moves:
+            yield start, moves, result if has_result else winner(state)
+
+    if log_moves:
+        yield start, log_moves, winner(log_state)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build an opening book from game files / client logs")
+    parser.add_argument("games", nargs="+", help="game files (book format or client.py output)")
+    parser.add_argument("--out", default="book.bin")
+    parser.add_argument("--setup", default=DEFAULT_SETUP, help="start position of games without a Setup line")
+    parser.add_argument("--plies", type=int, default=16, help="only the first N plies of each game")
+    parser.add_argument("--min-games", type=int, default=2, help="drop moves played in fewer games")
+    args = parser.parse_args()
+
+    start = setup_to_state("Setup " + args.setup)
+    games = []
+    for path in args.games:
+        with open(path) as f:
+            games.extend(read_games(f, start))
+
+    records = build_book(games, args.plies, args.min_games)
+    write_book(args.out, records)
+
+    positions = len({r[0] for r in records})
+    print(f"{len(games)} games -> {len(records)} moves in {positions} positions -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
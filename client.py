@@ -1,75 +1,104 @@
 import argparse
 import socket
+import threading
 
 from game.state import GameState
 from game.apply_move import apply_move
+from game.moves import generate_moves, move_to_str, str_to_move
 from game.terminal import is_terminal
+from game.tablebase import Tablebase
+from agents.book import Book
 from agents.alphabeta_agent import AlphaBetaAgent
+from protocol import (
+    Connection, setup_to_state,
+    SETUP, TIME, BEGIN, RESET, GAME_OVER, MOVE, EXIT, TOURNAMENT_ACCEPTED,
+)
 
 
-def send_msg(sock, msg):
-    sock.sendall((msg + "\n").encode())
-    print(f">>> {msg}")
+def send_msg(conn, msg):
+    conn.send(msg)
 
 
-def recv_msg(sock):
-    buf = b""
-    while True:
-        ch = sock.recv(1)
-        if not ch:
-            raise ConnectionError("Server closed connection")
-        if ch == b"\n":
-            break
-        buf += ch
-    msg = buf.decode().strip()
-    print(f"<<< {msg}")
-    return msg
+def recv_msg(conn):
+    return conn.recv_message()
 
 
-def recv_game_msg(sock):
+def recv_game_msg(conn):
     """
     Tournament-safe:
     - ignores TournamentAccepted
-    - when Reset arrives: sends Ready AND RETURNS "Reset" so caller can reset local state
+    - when Reset arrives: sends Ready AND RETURNS it so caller can reset local state
     """
     while True:
-        msg = recv_msg(sock)
-        if msg.startswith("TournamentAccepted"):
+        msg = recv_msg(conn)
+        if msg.kind == TOURNAMENT_ACCEPTED:
             continue
-        if msg == "Reset":
-            send_msg(sock, "Ready")
-            return "Reset"
+        if msg.kind == RESET:
+            send_msg(conn, "Ready")
         return msg
 
 
-def setup_to_state(msg):
-    tokens = msg.split()[1:]
-    white = 0
-    black = 0
-
-    for t in tokens:
-        color = t[0]
-        file = ord(t[1]) - ord('a')
-        rank = int(t[2]) - 1
-        sq = rank * 8 + file
-        if color == 'W':
-            white |= 1 << sq
-        else:
-            black |= 1 << sq
-
-    return GameState(white=white, black=black, side='w', en_passant=None)
-
+def clone_state(s: GameState) -> GameState:
+    return GameState(white=s.white, black=s.black, side=s.side, en_passant=s.en_passant)
 
-def alg_to_sq(a):
-    return (int(a[1]) - 1) * 8 + (ord(a[0]) - ord('a'))
 
+class Ponderer:
+    """
+    Searches on the opponent's time in a background thread: after our move,
+    the reply expected by the transposition table is played and the
+    position after it is searched (AlphaBetaAgent.ponder) until the real
+    reply arrives. Our clock is never running meanwhile.
+    """
 
-def sq_to_alg(sq):
-    return f"{chr(ord('a') + sq % 8)}{sq // 8 + 1}"
-
-
-def clone_state(s: GameState) -> GameState:
-    return GameState(white=s.white, black=s.black, side=s.side, en_passant=s.en_passant)
+    def __init__(self, agent):
+        self.agent = agent
+        self.stop = threading.Event()
+        self.thread = None
+        self.predicted = None
+        self.result = None
+        self.target_depth = 0
+
+    def start(self, state):
+        # state: opponent to move
+        predicted = self.agent.tt.best_move(state.key)
+        if predicted is None or predicted not in generate_moves(state):
+            return
+        ponder_state = apply_move(state, predicted)
+        if is_terminal(ponder_state):
+            return
+
+        self.predicted = predicted
+        self.result = None
+        # a hit is played directly if pondering got as deep as a normal search would
+        self.target_depth = self.agent.depth or self.agent.last_completed_depth
+        self.stop.clear()
+        self.thread = threading.Thread(target=self._run, args=(ponder_state, predicted), daemon=True)
+        self.thread.start()
+        print(f"[pondering on {move_to_str(predicted)}]")
+
+    def _run(self, state, last_move):
+        self.result = self.agent.ponder(state, last_move, self.stop)
+
+    def finish(self, reply):
+        """
+        Stop pondering. reply: the opponent's packed move, or None if the game ended.
+        Returns our move if the reply was predicted and the ponder search
+        completed, otherwise None (search normally; the table is already warm).
+        """
+        if self.thread is None:
+            return None
+        self.stop.set()
+        self.thread.join()
+        self.thread = None
+
+        if reply is None or self.result is None:
+            return None
+        move, _, depth = self.result
+        hit = reply == self.predicted
+        print(f"[ponder {'hit' if hit else 'miss'} | depth = {depth}]")
+        if hit and move is not None and depth >= self.target_depth:
+            return move
+        return None
 
 
 def main():
@@ -81,6 +110,31 @@ def main():
     parser.add_argument("--side", choices=["w", "b"],
                         required=True, help="w or b")
 
+    parser.add_argument("--tb", metavar="DIR", default=None,
+                        help="pawn endgame tables built by tbgen.py")
+
+    parser.add_argument("--book", metavar="FILE", default=None,
+                        help="opening book built by bookgen.py")
+
+    parser.add_argument("--book-mode", choices=["best", "weighted"], default="best",
+                        help="best scoring book move, or random weighted by games")
+
+    parser.add_argument("--depth", type=int, default=None,
+                        help="maximum search depth (default: as deep as the time budget allows)")
+
+    parser.add_argument("--workers", type=int, default=1,
+                        help="search processes")
+
+    parser.add_argument("--ponder", action="store_true",
+                        help="search on the opponent's time")
+
+    parser.add_argument("--parallel", choices=["smp", "root"], default="smp",
+                        help="smp: Lazy SMP on a shared transposition table, "
+                             "root: root moves split over a process pool")
+
+    parser.add_argument("--quiet", action="store_true",
+                        help="do not print protocol lines")
+
     args = parser.parse_args()
 
     args.host = args.net[0]
@@ -89,20 +143,32 @@ def main():
 
     sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
     sock.connect((args.host, args.port))
+    conn = Connection(sock, echo=not args.quiet)
     print("[connected]")
 
-    agent = AlphaBetaAgent(depth=4)
+    tablebase = Tablebase(args.tb) if args.tb else None
+    book = Book(args.book, args.book_mode) if args.book else None
+    agent = AlphaBetaAgent(depth=args.depth, tablebase=tablebase, book=book,
+                           workers=args.workers, parallel=args.parallel)
+    # spawn the search processes before the handshake, not on our clock
+    agent.start_workers()
+    ponderer = Ponderer(agent) if args.ponder else None
+    ponder_move = None
 
     # ── Initial handshake
-    send_msg(sock, "OK")
+    send_msg(conn, "OK")
 
-    setup_msg = recv_msg(sock)          # Setup ...
-    initial_state = setup_to_state(setup_msg)
-    send_msg(sock, "OK")
+    setup_msg = recv_msg(conn)          # Setup ...
+    if setup_msg.kind != SETUP:
+        raise RuntimeError(f"Expected Setup, got {setup_msg.text}")
+    initial_state = setup_msg.state
+    send_msg(conn, "OK")
 
-    time_msg = recv_msg(sock)           # Time N
-    total_minutes = float(time_msg.split()[1])
-    send_msg(sock, "OK")
+    time_msg = recv_msg(conn)           # Time N
+    if time_msg.kind != TIME:
+        raise RuntimeError(f"Expected Time, got {time_msg.text}")
+    total_minutes = time_msg.minutes
+    send_msg(conn, "OK")
 
     # We reset these at every round start (after Reset)
     state = clone_state(initial_state)
@@ -113,95 +179,109 @@ def main():
 
     # ───────────────── TOURNAMENT LOOP ─────────────────
     while True:
-        msg = recv_game_msg(sock)
+        msg = recv_game_msg(conn)
 
         # Handle Reset between rounds (MOST IMPORTANT FIX)
-        if msg == "Reset":
+        if msg.kind == RESET:
             state = clone_state(initial_state)
             last_move = None
             agent.start_game(total_minutes)  # new round gets a fresh clock
+            agent.new_game()
             continue
 
         # Some servers may resend Setup/Time between rounds (support it safely)
-        if msg.startswith("Setup"):
-            initial_state = setup_to_state(msg)
+        if msg.kind == SETUP:
+            initial_state = msg.state
             state = clone_state(initial_state)
             last_move = None
-            send_msg(sock, "OK")
+            send_msg(conn, "OK")
 
-            msg2 = recv_msg(sock)  # expect Time ...
-            if not msg2.startswith("Time"):
-                raise RuntimeError(f"Expected Time, got {msg2}")
-            total_minutes = float(msg2.split()[1])
-            send_msg(sock, "OK")
+            msg2 = recv_msg(conn)  # expect Time ...
+            if msg2.kind != TIME:
+                raise RuntimeError(f"Expected Time, got {msg2.text}")
+            total_minutes = msg2.minutes
+            send_msg(conn, "OK")
 
             agent.start_game(total_minutes)
+            agent.new_game()
             continue
 
         # End conditions
-        if msg == "exit":
+        if msg.kind == EXIT:
             break
-        if msg.startswith("GameOver"):
+        if msg.kind == GAME_OVER:
             # Don't exit tournament; server will send Reset next
             continue
 
         # Round start:
         # - "Begin" means we are WHITE and must move now
         # - otherwise it's opponent's first move, and then it's our turn
-        if msg == "Begin":
+        if msg.kind == BEGIN:
             my_color = args.side
             state.side = 'w'
             my_turn = True
         else:
             my_color = args.side
             state.side = 'w'
-            frm = alg_to_sq(msg[:2])
-            to = alg_to_sq(msg[2:])
-            state = apply_move(state, (frm, to))
-            last_move = (frm, to)
+            mv = str_to_move(state, msg.text)
+            state = apply_move(state, mv)
+            last_move = mv
             my_turn = True
 
         # ─────────────── SINGLE GAME LOOP ───────────────
         while True:
             if my_turn:
-                move = agent.choose_move(state, last_move)
+                if ponder_move is not None:
+                    # ponder hit: already searched on the opponent's time
+                    move = ponder_move
+                    ponder_move = None
+                    agent.ponder_hit()
+                else:
+                    move = agent.choose_move(state, last_move)
                 if move is None:
-                    send_msg(sock, "exit")   # resignation
+                    send_msg(conn, "exit")   # resignation
                     break
 
-                send_msg(sock, sq_to_alg(move[0]) + sq_to_alg(move[1]))
+                send_msg(conn, move_to_str(move))
                 state = apply_move(state, move)
                 last_move = move
                 my_turn = False
+                if ponderer is not None and not is_terminal(state):
+                    ponderer.start(state)
             else:
-                msg = recv_game_msg(sock)
+                msg = recv_game_msg(conn)
+
+                if ponderer is not None:
+                    ponder_move = ponderer.finish(str_to_move(state, msg.text) if msg.kind == MOVE else None)
 
-                if msg == "Reset":
+                if msg.kind == RESET:
                     # round ended; reset and go to outer loop
                     state = clone_state(initial_state)
                     state.side = 'w'
                     last_move = None
                     agent.start_game(total_minutes)
+                    agent.new_game()
                     break
 
-                if msg.startswith("GameOver"):
+                if msg.kind == GAME_OVER:
                     # wait for Reset next (handled above)
                     continue
 
-                if msg == "Begin":
+                if msg.kind == BEGIN:
                     my_turn = True
                     continue
 
-                if msg == "exit":
+                if msg.kind == EXIT:
+                    agent.close()
                     return
 
-                frm = alg_to_sq(msg[:2])
-                to = alg_to_sq(msg[2:])
-                state = apply_move(state, (frm, to))
-                last_move = (frm, to)
+                mv = str_to_move(state, msg.text)
+                state = apply_move(state, mv)
+                last_move = mv
                 my_turn = True
 
-    sock.close()
+    conn.close()
+    agent.close()
     print("[done]")
 
 
@@ -0,0 +1,45 @@
+from array import array
+
+
+class EvalCache:
+    """
+    Fixed-size cache of Board.structure_score(), the part of the evaluation
+    that depends on the two bitboards only (en passant is added by
+    Board.evaluate). Keyed by Board.pawn_key(); sibling nodes and
+    transpositions that differ only in side to move or en passant share
+    an entry.
+
+    One entry per slot, the newest position always replaces the old one.
+    Any term computed from (white, black) alone (doubled, isolated,
+    connected or blocked pawns, ...) can go into structure_score and is
+    then paid for once per structure instead of once per node.
+    """
+
+    def __init__(self, bits=16):
+        self.size = 1 << bits
+        self.mask = self.size - 1
+        self.keys = array('Q', [0]) * self.size
+        self.scores = array('i', [0]) * self.size
+        self.probes = 0
+        self.hits = 0
+
+    def structure_score(self, board):
+        key = board.pawn_key()
+        i = key & self.mask
+        self.probes += 1
+        if self.keys[i] == key:
+            self.hits += 1
+            return self.scores[i]
+
+        s = board.structure_score()
+        self.keys[i] = key
+        self.scores[i] = s
+        return s
+
+    def hit_rate(self):
+        return self.hits / self.probes if self.probes else 0.0
+
+    def clear(self):
+        self.keys = array('Q', [0]) * self.size
+        self.probes = 0
+        self.hits = 0
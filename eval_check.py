@@ -0,0 +1,381 @@
+import argparse
+import random
+import sys
+import time
+
+from game.state import GameState
+from game.board import Board
+from game.moves import generate_moves
+from game.terminal import is_terminal
+from game.evaluation import evaluate, W_MATERIAL, W_ADVANCE, W_MOBILITY, W_PASSED, W_THREAT
+
+
+# ─────────────────────────────────────────────
+# Reference evaluator: the original evaluation.py / moves.py code, verbatim
+# (generators renamed, they return (from, to) tuples)
+# ─────────────────────────────────────────────
+# An en passant square is the square a pawn has just passed over, so it is
+# always empty. The original threat count only looks at the target square and
+# would count an en passant "capture" onto an occupied square; evaluate() counts
+# en passant captures as mobility only. Such positions cannot occur in a game:
+# reference_evaluate refuses them and random_state does not generate them.
+
+FULL_BOARD = (1 << 64) - 1
+NOT_A_FILE = ~0x0101010101010101 & ((1 << 64) - 1)
+NOT_H_FILE = ~0x8080808080808080 & ((1 << 64) - 1)
+
+
+def iter_bits(bb):
+    while bb:
+        lsb = bb & -bb
+        yield lsb.bit_length() - 1
+        bb &= bb - 1
+
+
+def ref_white_moves(state: GameState):
+    moves = []
+
+    white = state.white
+    black = state.black
+    empty = ~(white | black) & FULL_BOARD
+
+    # ---------- single push ----------
+    single = (white << 8) & empty
+    for to_sq in iter_bits(single):
+        from_sq = to_sq - 8
+        moves.append((from_sq, to_sq))
+
+    # ---------- double push ----------
+    rank2 = white & 0x000000000000FF00
+    double = ((rank2 << 8) & empty) << 8 & empty
+    for to_sq in iter_bits(double):
+        from_sq = to_sq - 16
+        moves.append((from_sq, to_sq))
+
+    # ---------- captures ----------
+    diag_left = ((white & NOT_A_FILE) << 7) & (black)
+    diag_right = ((white & NOT_H_FILE) << 9) & (black)
+
+    for to_sq in iter_bits(diag_left):
+        moves.append((to_sq - 7, to_sq))
+
+    for to_sq in iter_bits(diag_right):
+        moves.append((to_sq - 9, to_sq))
+
+    # ---------- en passant ----------
+    if state.en_passant is not None:
+        ep = state.en_passant
+        ep_rank = ep // 8
+        if ep_rank == 5:
+            for delta in (7, 9):
+                from_sq = ep - delta
+                if 0 <= from_sq < 64 and (white >> from_sq) & 1:
+                    # verify diagonal
+                    if abs((from_sq % 8) - (ep % 8)) == 1:
+                        moves.append((from_sq, ep))
+
+    return moves
+
+
+def ref_black_moves(state: GameState):
+    moves = []
+
+    black = state.black
+    white = state.white
+    empty = ~(black | white) & FULL_BOARD
+
+    # ---------- 1) Single forward push ----------
+    single = (black >> 8) & empty
+    bb = single
+    while bb:
+        to_sq = (bb & -bb).bit_length() - 1
+        from_sq = to_sq + 8
+        moves.append((from_sq, to_sq))
+        bb &= bb - 1
+
+    # ---------- 2) Double forward push (from rank 7) ----------
+    rank7 = black & 0x00FF000000000000  # black pawns on rank 7
+    double = ((rank7 >> 8) & empty) >> 8 & empty
+    bb = double
+    while bb:
+        to_sq = (bb & -bb).bit_length() - 1
+        from_sq = to_sq + 16
+        moves.append((from_sq, to_sq))
+        bb &= bb - 1
+
+    # ---------- 3) Diagonal captures ----------
+    diag_right = ((black & NOT_H_FILE) >> 7) & (white)
+    diag_left = ((black & NOT_A_FILE) >> 9) & (white)
+
+    for to_sq in iter_bits(diag_right):
+        moves.append((to_sq + 7, to_sq))
+
+    for to_sq in iter_bits(diag_left):
+        moves.append((to_sq + 9, to_sq))
+
+    # ---------- 4) En passant ----------
+    if state.en_passant is not None:
+        ep = state.en_passant
+        ep_rank = ep // 8
+
+        # Black can capture en passant only on rank 3
+        if ep_rank == 2:
+            for delta in (7, 9):
+                from_sq = ep + delta
+                if 0 <= from_sq < 64 and ((black >> from_sq) & 1):
+                    # must be exactly one file away
+                    if abs((from_sq % 8) - (ep % 8)) == 1:
+                        moves.append((from_sq, ep))
+
+    return moves
+
+
+def pawn_advancement(state):
+    value = 0
+
+    # white pawns
+    bb = state.white
+    while bb:
+        sq = (bb & -bb).bit_length() - 1
+        row = sq // 8
+        value += row
+        bb &= bb - 1
+
+    # black pawns
+    bb = state.black
+    while bb:
+        sq = (bb & -bb).bit_length() - 1
+        row = sq // 8
+        value -= (7 - row)
+        bb &= bb - 1
+
+    return value
+
+def count_passed_white(state):
+    count = 0
+    bb = state.white
+    while bb:
+        sq = (bb & -bb).bit_length() - 1
+        file = sq % 8
+        rank = sq // 8
+
+        mask = 0
+        for r in range(rank + 1, 8):
+            for df in (-1, 0, 1):
+                f = file + df
+                if 0 <= f < 8:
+                    mask |= 1 << (r * 8 + f)
+
+        if (mask & state.black) == 0:
+            count += 1
+        bb &= bb - 1
+    return count
+
+
+def count_passed_black(state):
+    count = 0
+    bb = state.black
+    while bb:
+        sq = (bb & -bb).bit_length() - 1
+        file = sq % 8
+        rank = sq // 8
+
+        mask = 0
+        for r in range(rank - 1, -1, -1):
+            for df in (-1, 0, 1):
+                f = file + df
+                if 0 <= f < 8:
+                    mask |= 1 << (r * 8 + f)
+
+        if (mask & state.white) == 0:
+            count += 1
+        bb &= bb - 1
+    return count
+
+
+def threat_score(state):
+    white_caps = 0
+    black_caps = 0
+
+    for _, to_sq in ref_white_moves(state):
+        if (1 << to_sq) & state.black:
+            white_caps += 1
+
+    for _, to_sq in ref_black_moves(state):
+        if (1 << to_sq) & state.white:
+            black_caps += 1
+
+    return white_caps - black_caps
+
+
+def reference_evaluate(state):
+    """
+    Evaluation function.
+    Positive score = good for White
+    Negative score = good for Black
+    """
+    assert state.en_passant is None or not (state.white | state.black) >> state.en_passant & 1, \
+        f"occupied en passant square: {state}"
+
+    # Terminal positions
+    if is_terminal(state):
+        # win / loss
+        if state.white == 0:
+            return -10_000
+        if state.black == 0:
+            return 10_000
+
+        # promotion
+        if state.white & 0xFF00000000000000:
+            return 10_000
+        if state.black & 0x00000000000000FF:
+            return -10_000
+
+    score = 0
+
+    # -------------------------
+    # 1) Material
+    # -------------------------
+    white_pawns = state.white.bit_count()
+    black_pawns = state.black.bit_count()
+    score += W_MATERIAL * (white_pawns - black_pawns)
+
+    # -------------------------
+    # 2) Advancement
+    # -------------------------
+    score += W_ADVANCE * pawn_advancement(state)
+
+    # -------------------------
+    # 3) Mobility
+    # -------------------------
+    white_moves = len(ref_white_moves(state))
+    black_moves = len(ref_black_moves(state))
+    score += W_MOBILITY * (white_moves - black_moves)
+
+    # -------------------------
+    # 4) Passed pawns
+    # -------------------------
+    score += W_PASSED * (count_passed_white(state) - count_passed_black(state))
+
+    # -------------------------
+    # 5) Immediate threats
+    # -------------------------
+    score += W_THREAT * threat_score(state)
+
+    return score
+
+
+# ─────────────────────────────────────────────
+# Random positions
+# ─────────────────────────────────────────────
+
+def random_state(rng):
+    """
+    Random pawn placement, mostly on ranks 2-7 but sometimes anywhere
+    (terminal positions included), with a random empty en passant square.
+    """
+    squares = list(range(64)) if rng.random() < 0.1 else list(range(8, 56))
+    rng.shuffle(squares)
+    nw = rng.randint(0, 8)
+    nb = rng.randint(0, 8)
+
+    white = 0
+    black = 0
+    for sq in squares[:nw]:
+        white |= 1 << sq
+    for sq in squares[nw:nw + nb]:
+        black |= 1 << sq
+
+    en_passant = None
+    r = rng.random()
+    if r < 0.3:
+        en_passant = rng.choice((16, 40)) + rng.randrange(8)
+    elif r < 0.35:
+        en_passant = rng.randrange(64)
+    if en_passant is not None and (white | black) >> en_passant & 1:
+        en_passant = None
+
+    return GameState(white=white, black=black, side=rng.choice('wb'), en_passant=en_passant)
+
+
+def check_evaluate(samples, seed, evaluator=evaluate):
+    """Compare evaluator against the reference; returns the mismatching states."""
+    rng = random.Random(seed)
+    bad = []
+    for _ in range(samples):
+        state = random_state(rng)
+        if evaluator(state) != reference_evaluate(state):
+            bad.append(state)
+    return bad
+
+
+def check_batch(samples, seed):
+    """
+    Compare game.batch_eval (NumPy) with evaluate / generate_moves / apply_move
+    on the same random positions; prints the timings, returns the mismatching states.
+    """
+    from game import batch_eval   # needs NumPy
+
+    rng = random.Random(seed)
+    states = [random_state(rng) for _ in range(samples)]
+    white, black, side, en_passant = batch_eval.from_states(states)
+
+    t0 = time.perf_counter()
+    scores = batch_eval.evaluate(white, black, en_passant)
+    counts = batch_eval.count_moves(white, black, side, en_passant)
+    t_batch = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    ref_scores = [evaluate(s) for s in states]
+    ref_counts = [len(generate_moves(s)) for s in states]
+    t_scalar = time.perf_counter() - t0
+
+    bad = [s for s, a, b, c, d in zip(states, scores.tolist(), ref_scores, counts.tolist(), ref_counts)
+           if a != b or c != d]
+
+    # move lists: scores of every child of the non-terminal positions
+    # (Board: random en passant squares need not be legal for apply_move)
+    for s in states[:1000]:
+        moves = generate_moves(s)
+        if not moves or is_terminal(s):
+            continue
+        board = Board.from_state(s)
+        sign = 1 if s.side == 'w' else -1
+        expected = []
+        for m in moves:
+            board.make_move(m)
+            expected.append(sign * evaluate(board))
+            board.unmake_move()
+        if batch_eval.evaluate_moves(s, moves).tolist() != expected:
+            bad.append(s)
+
+    print(f"batch: {t_batch * 1000:.1f} ms | scalar: {t_scalar * 1000:.1f} ms | "
+          f"speedup: {t_scalar / t_batch:.0f}x")
+    return bad
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Differential check of evaluate() against the reference evaluator")
+    parser.add_argument("--samples", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--batch", action="store_true",
+                        help="check the NumPy batch evaluator / move counter against evaluate() instead")
+    args = parser.parse_args()
+
+    if args.batch:
+        bad = check_batch(args.samples, args.seed)
+        for state in bad[:10]:
+            print(f"batch mismatch: {state}")
+        print(f"{args.samples} positions, {len(bad)} mismatches")
+        sys.exit(1 if bad else 0)
+
+    bad = check_evaluate(args.samples, args.seed)
+    for state in bad[:10]:
+        print(f"mismatch: {state} -> {evaluate(state)} vs {reference_evaluate(state)}")
+
+    print(f"{args.samples} positions, {len(bad)} mismatches")
+    sys.exit(1 if bad else 0)
+
+
+if __name__ == "__main__":
+    main()
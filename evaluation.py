@@ -1,5 +1,7 @@
-from source_code_files.game.moves import generate_white_moves, generate_black_moves
-from source_code_files.game.terminal import is_terminal
+from source_code_files.game.moves import (
+    NOT_A_FILE, NOT_H_FILE, FULL_BOARD, RANK_2, RANK_7,
+    WHITE_PAWN_ATTACKS, BLACK_PAWN_ATTACKS,
+)
 
 
 # -------------------------
@@ -11,82 +13,111 @@ W_MOBILITY   = 5
 W_PASSED     = 30
 W_THREAT     = 20
 
-def pawn_advancement(state):
-    value = 0
+# Everything below is setwise: shifted bitboards + int.bit_count(),
+# no move lists. Scores are identical to the old list-based evaluator
+# (see eval_check.py for the differential check).
+
+RANK_MASKS = [0xFF << (8 * r) for r in range(8)]
+FILE_MASKS = [0x0101010101010101 << f for f in range(8)]
+
+# file f plus its neighbours: the files whose passed-pawn status can
+# change when a pawn appears on / disappears from file f
+ADJACENT_FILES = [
+    FILE_MASKS[f] | (FILE_MASKS[f - 1] if f > 0 else 0) | (FILE_MASKS[f + 1] if f < 7 else 0)
+    for f in range(8)
+]
+
+PROMO_WHITE = 0xFF00000000000000
+PROMO_BLACK = 0x00000000000000FF
+
+
+def _south_fill(bb):
+    bb |= bb >> 8
+    bb |= bb >> 16
+    bb |= bb >> 32
+    return bb
+
 
-    # white pawns
-    bb = state.white
-    while bb:
-        sq = (bb & -bb).bit_length() - 1
-        row = sq // 8
-        value += row
-        bb &= bb - 1
-
-    # black pawns
-    bb = state.black
-    while bb:
-        sq = (bb & -bb).bit_length() - 1
-        row = sq // 8
-        value -= (7 - row)
-        bb &= bb - 1
+def _north_fill(bb):
+    bb |= bb << 8
+    bb |= bb << 16
+    bb |= bb << 32
+    return bb & FULL_BOARD
 
+
+def _spread(bb):
+    # add the two neighbouring files
+    return bb | ((bb & NOT_A_FILE) >> 1) | ((bb & NOT_H_FILE) << 1)
+
+
+def passed_white(white, black):
+    # white pawns with no black pawn ahead on the same or adjacent files
+    return white & ~_spread(_south_fill(black >> 8))
+
+
+def passed_black(white, black):
+    return black & ~_spread(_north_fill(white << 8))
+
+
+def pawn_advancement(state):
+    value = 0
+    white = state.white
+    black = state.black
+    for r in range(1, 8):
+        value += r * (white & RANK_MASKS[r]).bit_count()
+    for r in range(7):
+        value -= (7 - r) * (black & RANK_MASKS[r]).bit_count()
     return value
 
+
 def count_passed_white(state):
-    count = 0
-    bb = state.white
-    while bb:
-        sq = (bb & -bb).bit_length() - 1
-        file = sq % 8
-        rank = sq // 8
-
-        mask = 0
-        for r in range(rank + 1, 8):
-            for df in (-1, 0, 1):
-                f = file + df
-                if 0 <= f < 8:
-                    mask |= 1 << (r * 8 + f)
-
-        if (mask & state.black) == 0:
-            count += 1
-        bb &= bb - 1
-    return count
+    return passed_white(state.white, state.black).bit_count()
 
 
 def count_passed_black(state):
-    count = 0
-    bb = state.black
-    while bb:
-        sq = (bb & -bb).bit_length() - 1
-        file = sq % 8
-        rank = sq // 8
-
-        mask = 0
-        for r in range(rank - 1, -1, -1):
-            for df in (-1, 0, 1):
-                f = file + df
-                if 0 <= f < 8:
-                    mask |= 1 << (r * 8 + f)
-
-        if (mask & state.white) == 0:
-            count += 1
-        bb &= bb - 1
-    return count
+    return passed_black(state.white, state.black).bit_count()
 
 
 def threat_score(state):
-    white_caps = 0
-    black_caps = 0
+    white = state.white
+    black = state.black
+    white_caps = (((white & NOT_A_FILE) << 7) & black).bit_count() + (((white & NOT_H_FILE) << 9) & black).bit_count()
+    black_caps = (((black & NOT_H_FILE) >> 7) & white).bit_count() + (((black & NOT_A_FILE) >> 9) & white).bit_count()
+    return white_caps - black_caps
+
 
-    for _, to_sq in generate_white_moves(state):
-        if (1 << to_sq) & state.black:
-            white_caps += 1
+def mobility_threats(white, black, en_passant):
+    """
+    (white_moves - black_moves, white_caps - black_caps), i.e. the list
+    lengths and capture counts of generate_white_moves / generate_black_moves.
+    """
+    empty = ~(white | black) & FULL_BOARD
 
-    for _, to_sq in generate_black_moves(state):
-        if (1 << to_sq) & state.white:
-            black_caps += 1
+    w_single = (white << 8) & empty
+    w_double = (((white & RANK_2) << 8) & empty) << 8 & empty
+    w_caps = (((white & NOT_A_FILE) << 7) & black).bit_count() + (((white & NOT_H_FILE) << 9) & black).bit_count()
 
-    return white_caps - black_caps
+    b_single = (black >> 8) & empty
+    b_double = (((black & RANK_7) >> 8) & empty) >> 8 & empty
+    b_caps = (((black & NOT_H_FILE) >> 7) & white).bit_count() + (((black & NOT_A_FILE) >> 9) & white).bit_count()
+
+    mobility = (w_single.bit_count() + w_double.bit_count() + w_caps) - (b_single.bit_count() + b_double.bit_count() + b_caps)
+    if en_passant is not None:
+        mobility += ep_mobility(white, black, en_passant)
+
+    return mobility, w_caps - b_caps
+
+
+def ep_mobility(white, black, en_passant):
+    # en passant captures (white - black): pawns that attack the ep square,
+    # same rank checks as movegen. The only term that is not a function of
+    # the two bitboards alone.
+    ep_rank = en_passant // 8
+    if ep_rank == 5:
+        return (white & BLACK_PAWN_ATTACKS[en_passant]).bit_count()
+    if ep_rank == 2:
+        return -(black & WHITE_PAWN_ATTACKS[en_passant]).bit_count()
+    return 0
 
 
 def evaluate(state):
@@ -95,29 +126,25 @@ def evaluate(state):
     Positive score = good for White
     Negative score = good for Black
     """
-
-    # Terminal positions
-    if is_terminal(state):
-        # win / loss
-        if state.white == 0:
-            return -10_000
-        if state.black == 0:
-            return 10_000
-
-        # promotion
-        if state.white & 0xFF00000000000000:
-            return 10_000
-        if state.black & 0x00000000000000FF:
-            return -10_000
+    white = state.white
+    black = state.black
+
+    # Terminal positions (same order of checks as before)
+    if white == 0:
+        return -10_000
+    if black == 0:
+        return 10_000
+    if white & PROMO_WHITE:
+        return 10_000
+    if black & PROMO_BLACK:
+        return -10_000
 
     score = 0
 
     # -------------------------
     # 1) Material
     # -------------------------
-    white_pawns = state.white.bit_count()
-    black_pawns = state.black.bit_count()
-    score += W_MATERIAL * (white_pawns - black_pawns)
+    score += W_MATERIAL * (white.bit_count() - black.bit_count())
 
     # -------------------------
     # 2) Advancement
@@ -125,20 +152,15 @@ def evaluate(state):
     score += W_ADVANCE * pawn_advancement(state)
 
     # -------------------------
-    # 3) Mobility
+    # 3) Mobility + 5) Immediate threats
     # -------------------------
-    white_moves = len(generate_white_moves(state))
-    black_moves = len(generate_black_moves(state))
-    score += W_MOBILITY * (white_moves - black_moves)
+    mobility, threats = mobility_threats(white, black, state.en_passant)
+    score += W_MOBILITY * mobility
+    score += W_THREAT * threats
 
     # -------------------------
     # 4) Passed pawns
     # -------------------------
-    score += W_PASSED * (count_passed_white(state) - count_passed_black(state))
-
-    # -------------------------
-    # 5) Immediate threats
-    # -------------------------
-    score += W_THREAT * threat_score(state)
+    score += W_PASSED * (passed_white(white, black).bit_count() - passed_black(white, black).bit_count())
 
     return score
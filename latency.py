@@ -0,0 +1,91 @@
+import argparse
+import socket
+import time
+from multiprocessing import Process
+
+from protocol import LineReader, send_line
+
+
+# ─────────────────────────────────────────────
+# Echo stand-in for the server
+# ─────────────────────────────────────────────
+
+def echo_server(sock):
+    # answers every line with the same line, like a server relaying a move
+    conn, _ = sock.accept()
+    reader = LineReader(conn)
+    try:
+        while True:
+            send_line(conn, reader.readline())
+    except ConnectionError:
+        pass
+    conn.close()
+
+
+# ─────────────────────────────────────────────
+# Readers
+# ─────────────────────────────────────────────
+
+def recv_bytewise(sock):
+    # the original client.recv_msg: one recv per byte
+    buf = b""
+    while True:
+        ch = sock.recv(1)
+        if not ch:
+            raise ConnectionError("Server closed connection")
+        if ch == b"\n":
+            break
+        buf += ch
+    return buf.decode().strip()
+
+
+def round_trips(port, message, count, reader_name):
+    """Seconds per send + receive of message over a fresh connection."""
+    sock = socket.create_connection(("127.0.0.1", port))
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    if reader_name == "bytewise":
+        read = lambda: recv_bytewise(sock)  # noqa: E731
+    else:
+        read = LineReader(sock).readline
+
+    for _ in range(100):                # warm up
+        send_line(sock, message)
+        read()
+
+    t0 = time.perf_counter()
+    for _ in range(count):
+        send_line(sock, message)
+        if read() != message:
+            raise RuntimeError("echo mismatch")
+    secs = (time.perf_counter() - t0) / count
+    sock.close()
+    return secs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Round-trip latency of the client protocol layer against a local echo server")
+    parser.add_argument("--count", type=int, default=5000, help="round trips per measurement")
+    args = parser.parse_args()
+
+    messages = [
+        ("move", "e2e4"),
+        ("setup", "Setup Wa2 Wb2 Wc2 Wd2 We2 Wf2 Wg2 Wh2 Ba7 Bb7 Bc7 Bd7 Be7 Bf7 Bg7 Bh7"),
+    ]
+
+    print(f"{'message':<10}{'reader':<12}{'round trip':>14}")
+    for msg_name, message in messages:
+        for reader_name in ("bytewise", "buffered"):
+            srv = socket.socket()
+            srv.bind(("127.0.0.1", 0))
+            srv.listen(1)
+            server = Process(target=echo_server, args=(srv,), daemon=True)
+            server.start()
+
+            secs = round_trips(srv.getsockname()[1], message, args.count, reader_name)
+            server.join()
+            srv.close()
+            print(f"{msg_name:<10}{reader_name:<12}{secs * 1e6:>11.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import time
+from multiprocessing import Pool
+
+from game.apply_move import apply_move
+from game.moves import generate_moves, move_to_str
+from game.terminal import winner
+from agents.alphabeta_agent import AlphaBetaAgent
+from protocol import setup_to_state
+from play_local import DEFAULT_SETUP
+
+
+MAX_PLIES = 300
+
+
+# ─────────────────────────────────────────────
+# Rules shared with server.py
+# ─────────────────────────────────────────────
+
+def outcome(state):
+    """
+    (result, reason) once the game is over, None while it goes on.
+    result is "1-0", "0-1" or "1/2-1/2"; a side without a legal move draws.
+    """
+    w = winner(state)
+    if w is not None:
+        return ("1-0" if w == 'w' else "0-1"), "terminal"
+    if not generate_moves(state):
+        return "1/2-1/2", "no moves"
+    return None
+
+
+def loss_for(side):
+    return "0-1" if side == 'w' else "1-0"
+
+
+def random_opening(start, plies, rng):
+    """
+    Play `plies` random legal moves from start (retrying if the game ends).
+    Returns (state, [packed moves]).
+    """
+    for _ in range(100):
+        state = start
+        moves = []
+        for _ in range(plies):
+            legal = generate_moves(state)
+            if not legal:
+                break
+            mv = rng.choice(legal)
+            state = apply_move(state, mv)
+            moves.append(mv)
+            if outcome(state) is not None:
+                break
+        if len(moves) == plies and outcome(state) is None:
+            return state, moves
+    return start, []
+
+
+# ─────────────────────────────────────────────
+# One game (runs in a pool worker)
+# ─────────────────────────────────────────────
+
+def play_game(job):
+    """
+    job: dict with id, seed, setup, plies, minutes, white / black (agent kwargs),
+    white_name / black_name. Returns the result record (moves as text,
+    opening moves included).
+    """
+    rng = random.Random(job["seed"])
+    start = setup_to_state("Setup " + job["setup"])
+    state, opening = random_opening(start, job["plies"], rng)
+
+    agents = {
+        'w': AlphaBetaAgent(**job["white"]),
+        'b': AlphaBetaAgent(**job["black"]),
+    }
+    for agent in agents.values():
+        agent.start_game(job["minutes"])
+
+    moves = list(opening)
+    last_move = moves[-1] if moves else None
+    t0 = time.perf_counter()
+
+    while True:
+        over = outcome(state)
+        if over is not None:
+            result, reason = over
+            break
+        if len(moves) >= job.get("max_plies", MAX_PLIES):
+            result, reason = "1/2-1/2", "max plies"
+            break
+
+        agent = agents[state.side]
+        with contextlib.redirect_stdout(io.StringIO()):
+            mv = agent.choose_move(state, last_move)
+        if mv is None:
+            result, reason = loss_for(state.side), "time"
+            break
+
+        state = apply_move(state, mv)
+        moves.append(mv)
+        last_move = mv
+
+    for agent in agents.values():
+        agent.close()
+
+    return {
+        "id": job["id"],
+        "seed": job["seed"],
+        "white": job["white_name"],
+        "black": job["black_name"],
+        "result": result,
+        "reason": reason,
+        "plies": len(moves),
+        "opening_plies": len(opening),
+        "time": round(time.perf_counter() - t0, 3),
+        "clock": {"w": round(agents['w'].get_time_left(), 3), "b": round(agents['b'].get_time_left(), 3)},
+        "setup": job["setup"],
+        "moves": [move_to_str(m) for m in moves],
+    }
+
+
+def make_jobs(games, seed, setup, plies, minutes, a, b, names=("A", "B")):
+    """
+    Colour-swapped pairs: games 2k and 2k + 1 share an opening seed,
+    A is White in the first and Black in the second.
+    """
+    jobs = []
+    for i in range(games):
+        a_white = i % 2 == 0
+        jobs.append({
+            "id": i,
+            "seed": seed + i // 2,
+            "setup": setup,
+            "plies": plies,
+            "minutes": minutes,
+            "white": a if a_white else b,
+            "black": b if a_white else a,
+            "white_name": names[0] if a_white else names[1],
+            "black_name": names[1] if a_white else names[0],
+        })
+    return jobs
+
+
+def write_game_log(directory, rec):
+    # book format (see bookgen.py): Setup line, then moves and the result
+    path = os.path.join(directory, f"game_{rec['id']:05d}.txt")
+    with open(path, "w") as f:
+        f.write(f"Setup {rec['setup']}\n")
+        f.write(" ".join(rec["moves"] + [rec["result"]]) + "\n")
+
+
+def score_for(rec, name):
+    # 1 / 0.5 / 0 for the named engine
+    if rec["result"] == "1/2-1/2":
+        return 0.5
+    white_won = rec["result"] == "1-0"
+    return 1.0 if white_won == (rec["white"] == name) else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Engine-vs-engine match in parallel processes")
+    parser.add_argument("--games", type=int, default=100)
+    parser.add_argument("--a", default="{}", help="JSON kwargs of AlphaBetaAgent A, e.g. '{\"depth\": 5}'")
+    parser.add_argument("--b", default="{}", help="JSON kwargs of AlphaBetaAgent B")
+    parser.add_argument("--minutes", type=float, default=1.0, help="game time per side")
+    parser.add_argument("--setup", default=DEFAULT_SETUP)
+    parser.add_argument("--plies", type=int, default=2, help="random opening plies")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--jobs", type=int, default=None, help="parallel games (default: all cores)")
+    parser.add_argument("--out", default="match.jsonl", help="one JSON result per game")
+    parser.add_argument("--log-dir", default=None, help="also write each game in book format here")
+    args = parser.parse_args()
+
+    a = json.loads(args.a)
+    b = json.loads(args.b)
+    jobs = make_jobs(args.games, args.seed, args.setup, args.plies, args.minutes, a, b)
+    if args.log_dir:
+        os.makedirs(args.log_dir, exist_ok=True)
+
+    score = 0.0
+    done = 0
+    with Pool(args.jobs) as pool, open(args.out, "w") as out:
+        for rec in pool.imap_unordered(play_game, jobs):
+            out.write(json.dumps(rec) + "\n")
+            out.flush()
+            if args.log_dir:
+                write_game_log(args.log_dir, rec)
+            done += 1
+            score += score_for(rec, "A")
+            print(f"game {rec['id']:>4}: {rec['white']} - {rec['black']} {rec['result']:<8} "
+                  f"({rec['reason']}, {rec['plies']} plies) | A {score}/{done}")
+
+    print(f"\nA scored {score} / {done} -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
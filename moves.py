@@ -5,6 +5,58 @@ NOT_A_FILE = ~0x0101010101010101 & ((1 << 64) - 1)
 NOT_H_FILE = ~0x8080808080808080 & ((1 << 64) - 1)
 FULL_BOARD = (1 << 64) - 1
 
+RANK_2 = 0x000000000000FF00
+RANK_7 = 0x00FF000000000000
+
+# squares attacked by a single pawn standing on sq
+WHITE_PAWN_ATTACKS = [(((1 << s) & NOT_A_FILE) << 7 | ((1 << s) & NOT_H_FILE) << 9) & FULL_BOARD for s in range(64)]
+BLACK_PAWN_ATTACKS = [((1 << s) & NOT_H_FILE) >> 7 | ((1 << s) & NOT_A_FILE) >> 9 for s in range(64)]
+
+# Packed move: from_sq | to_sq << 6 | flags
+MOVE_SQUARES = 0xFFF        # from/to part, used as search-table index
+MOVE_CAPTURE = 1 << 12
+MOVE_DOUBLE = 1 << 13       # double push (sets en passant square)
+MOVE_EP = 1 << 14           # en passant, always together with MOVE_CAPTURE
+
+
+def move_from(move):
+    return move & 63
+
+
+def move_to(move):
+    return (move >> 6) & 63
+
+
+def is_capture(move):
+    return (move & MOVE_CAPTURE) != 0
+
+
+def alg_to_sq(a):
+    return (int(a[1]) - 1) * 8 + (ord(a[0]) - ord('a'))
+
+
+def sq_to_alg(sq):
+    return f"{chr(ord('a') + sq % 8)}{sq // 8 + 1}"
+
+
+def move_to_str(move):
+    # wire format, e.g. "e2e4"
+    return sq_to_alg(move & 63) + sq_to_alg((move >> 6) & 63)
+
+
+def str_to_move(state, text):
+    """
+    Parse a wire-format move ("e2e4") in the given position.
+    Flags are taken from the matching generated move; if none matches
+    (should not happen with a validating server) the bare from/to is returned,
+    which apply_move still handles.
+    """
+    squares = alg_to_sq(text[:2]) | (alg_to_sq(text[2:4]) << 6)
+    for m in generate_moves(state):
+        if (m & MOVE_SQUARES) == squares:
+            return m
+    return squares
+
 
 def iter_bits(bb):
     while bb:
@@ -20,7 +72,7 @@ def sanity_check_move(f, t):
     assert df <= 1, f"illegal file diff {f}->{t}"
 
 
-def generate_white_moves(state: GameState):
+def generate_white_quiets(state: GameState):
     moves = []
 
     white = state.white
@@ -31,24 +83,33 @@ def generate_white_moves(state: GameState):
     single = (white << 8) & empty
     for to_sq in iter_bits(single):
         from_sq = to_sq - 8
-        moves.append((from_sq, to_sq))
+        moves.append(from_sq | (to_sq << 6))
 
     # ---------- double push ----------
     rank2 = white & 0x000000000000FF00
     double = ((rank2 << 8) & empty) << 8 & empty
     for to_sq in iter_bits(double):
         from_sq = to_sq - 16
-        moves.append((from_sq, to_sq))
+        moves.append(from_sq | (to_sq << 6) | MOVE_DOUBLE)
+
+    return moves
+
+
+def generate_white_captures(state: GameState):
+    moves = []
+
+    white = state.white
+    black = state.black
 
     # ---------- captures ----------
     diag_left = ((white & NOT_A_FILE) << 7) & (black)
     diag_right = ((white & NOT_H_FILE) << 9) & (black)
 
     for to_sq in iter_bits(diag_left):
-        moves.append((to_sq - 7, to_sq))
+        moves.append((to_sq - 7) | (to_sq << 6) | MOVE_CAPTURE)
 
     for to_sq in iter_bits(diag_right):
-        moves.append((to_sq - 9, to_sq))
+        moves.append((to_sq - 9) | (to_sq << 6) | MOVE_CAPTURE)
 
     # ---------- en passant ----------
     if state.en_passant is not None:
@@ -60,12 +121,16 @@ def generate_white_moves(state: GameState):
                 if 0 <= from_sq < 64 and (white >> from_sq) & 1:
                     # verify diagonal
                     if abs((from_sq % 8) - (ep % 8)) == 1:
-                        moves.append((from_sq, ep))
+                        moves.append(from_sq | (ep << 6) | MOVE_CAPTURE | MOVE_EP)
 
     return moves
 
 
-def generate_black_moves(state: GameState):
+def generate_white_moves(state: GameState):
+    return generate_white_quiets(state) + generate_white_captures(state)
+
+
+def generate_black_quiets(state: GameState):
     moves = []
 
     black = state.black
@@ -78,7 +143,7 @@ def generate_black_moves(state: GameState):
     while bb:
         to_sq = (bb & -bb).bit_length() - 1
         from_sq = to_sq + 8
-        moves.append((from_sq, to_sq))
+        moves.append(from_sq | (to_sq << 6))
         bb &= bb - 1
 
     # ---------- 2) Double forward push (from rank 7) ----------
@@ -88,18 +153,27 @@ def generate_black_moves(state: GameState):
     while bb:
         to_sq = (bb & -bb).bit_length() - 1
         from_sq = to_sq + 16
-        moves.append((from_sq, to_sq))
+        moves.append(from_sq | (to_sq << 6) | MOVE_DOUBLE)
         bb &= bb - 1
 
+    return moves
+
+
+def generate_black_captures(state: GameState):
+    moves = []
+
+    black = state.black
+    white = state.white
+
     # ---------- 3) Diagonal captures ----------
     diag_right = ((black & NOT_H_FILE) >> 7) & (white)
     diag_left = ((black & NOT_A_FILE) >> 9) & (white)
 
     for to_sq in iter_bits(diag_right):
-        moves.append((to_sq + 7, to_sq))
+        moves.append((to_sq + 7) | (to_sq << 6) | MOVE_CAPTURE)
 
     for to_sq in iter_bits(diag_left):
-        moves.append((to_sq + 9, to_sq))
+        moves.append((to_sq + 9) | (to_sq << 6) | MOVE_CAPTURE)
 
     # ---------- 4) En passant ----------
     if state.en_passant is not None:
@@ -113,19 +187,63 @@ def generate_black_moves(state: GameState):
                 if 0 <= from_sq < 64 and ((black >> from_sq) & 1):
                     # must be exactly one file away
                     if abs((from_sq % 8) - (ep % 8)) == 1:
-                        moves.append((from_sq, ep))
+                        moves.append(from_sq | (ep << 6) | MOVE_CAPTURE | MOVE_EP)
 
     return moves
 
 
+def generate_black_moves(state: GameState):
+    return generate_black_quiets(state) + generate_black_captures(state)
+
+
+def generate_captures(state: GameState):
+    # captures only (incl. en passant), for quiescence and the move picker
+    return generate_white_captures(state) if state.side == 'w' else generate_black_captures(state)
+
+
+def generate_quiets(state: GameState):
+    return generate_white_quiets(state) if state.side == 'w' else generate_black_quiets(state)
+
+
+def is_pseudo_legal(state: GameState, move):
+    """
+    Would the generator produce this packed move in this position?
+    Used to validate hash / killer / counter moves taken from other nodes.
+    """
+    from_sq = move & 63
+    to_sq = (move >> 6) & 63
+    occupied = state.white | state.black
+
+    if state.side == 'w':
+        if not (state.white >> from_sq) & 1:
+            return False
+        if move & MOVE_EP:
+            return to_sq == state.en_passant and to_sq // 8 == 5 and (BLACK_PAWN_ATTACKS[to_sq] >> from_sq) & 1 == 1
+        if move & MOVE_CAPTURE:
+            return (state.black >> to_sq) & 1 == 1 and (WHITE_PAWN_ATTACKS[from_sq] >> to_sq) & 1 == 1
+        if move & MOVE_DOUBLE:
+            return 8 <= from_sq < 16 and to_sq == from_sq + 16 and not occupied & ((1 << (from_sq + 8)) | (1 << to_sq))
+        return to_sq == from_sq + 8 and not (occupied >> to_sq) & 1
+
+    if not (state.black >> from_sq) & 1:
+        return False
+    if move & MOVE_EP:
+        return to_sq == state.en_passant and to_sq // 8 == 2 and (WHITE_PAWN_ATTACKS[to_sq] >> from_sq) & 1 == 1
+    if move & MOVE_CAPTURE:
+        return (state.white >> to_sq) & 1 == 1 and (BLACK_PAWN_ATTACKS[from_sq] >> to_sq) & 1 == 1
+    if move & MOVE_DOUBLE:
+        return 48 <= from_sq < 56 and to_sq == from_sq - 16 and not occupied & ((1 << (from_sq - 8)) | (1 << to_sq))
+    return to_sq == from_sq - 8 and not (occupied >> to_sq) & 1
+
+
 def generate_moves(state: GameState):
     moves = generate_white_moves(state) if state.side == 'w' else generate_black_moves(state)
 
     DEBUG = False
     # --- SANITY CHECK (DEBUG ONLY) ---
     if DEBUG:
-        for f, t in moves:
-            sanity_check_move(f, t)
+        for m in moves:
+            sanity_check_move(m & 63, (m >> 6) & 63)
 
     return moves
 
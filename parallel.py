@@ -0,0 +1,290 @@
+# agents/parallel.py
+import multiprocessing as mp
+import queue
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, wait
+
+from source_code_files.game.board import Board
+from source_code_files.game.state import GameState
+from source_code_files.agents.transposition import TranspositionTable, shared_table
+
+# how long to wait for a helper to report back after the stop flag is set
+HELPER_STOP_TIMEOUT = 5.0
+# ... and for all helpers to be ready after starting them
+HELPER_START_TIMEOUT = 30.0
+
+
+def _helper_main(worker_id, shm, tt_bits, agent_kwargs, jobs, results, stop_event):
+    """
+    Helper process: waits for jobs and runs iterative deepening on the
+    shared table. Reports every completed iteration and a final "done".
+    """
+    # imported here: alphabeta_agent imports this module
+    from source_code_files.agents.alphabeta_agent import AlphaBetaAgent
+
+    tablebase_dir = agent_kwargs.pop("tablebase_dir", None)
+    if tablebase_dir is not None:
+        from source_code_files.game.tablebase import Tablebase
+        agent_kwargs["tablebase"] = Tablebase(tablebase_dir)
+
+    agent = AlphaBetaAgent(**agent_kwargs)
+    agent.tt = TranspositionTable(tt_bits, shm.buf)
+    agent.stop_event = stop_event
+    agent.verbose = False
+    # stagger: odd helpers skip depth 1, every helper rotates the root moves
+    agent.start_depth = 1 + worker_id % 2
+    agent.root_shift = worker_id
+    # ready (search id 0 is never used by a search)
+    results.put((0, worker_id, None, 0, None))
+
+    while True:
+        job = jobs.get()
+        if job is None:
+            break
+        search_id, white, black, side, en_passant, last_move, deadline, depth = job
+
+        agent.depth = depth
+        agent.nodes = 0
+        agent.qnodes = 0
+        agent._start_search_clock()
+        agent._deadline = deadline
+        agent.new_search()
+
+        board = Board.from_state(GameState(white=white, black=black, side=side, en_passant=en_passant))
+        agent._iterate(board, last_move)
+        for it in agent.iterations:
+            results.put((search_id, worker_id, it["depth"], it["score"], it["move"]))
+        results.put((search_id, worker_id, None, agent.nodes + agent.qnodes, None))
+
+
+class LazySMP:
+    """
+    Lazy SMP: the agent's own search plus workers - 1 helper processes,
+    all searching the same root on one transposition table in shared
+    memory. Helpers differ in start depth and root move order, so they
+    fill the table with different subtrees the main search then reuses.
+    The deepest completed iteration wins (the main search on ties).
+
+    Helpers are started once and kept for the whole game / tournament.
+    """
+
+    def __init__(self, agent, workers):
+        self.agent = agent
+        self.workers = workers
+        self.search_id = 0
+
+        self.bits = bits = agent.tt.mask.bit_length()
+        self.shm, agent.tt = shared_table(bits)
+
+        ctx = mp.get_context()
+        self.stop_event = ctx.Event()
+        self.results = ctx.Queue()
+        self.jobs = []
+        self.procs = []
+
+        agent_kwargs = {
+            "depth": agent.depth,
+            "tt_bits": 0,           # replaced by the shared table
+            "poll_latency": agent.poll_latency,
+            "eval_cache_bits": agent.eval_cache_bits,
+            **agent.search_options(),
+        }
+        if agent.tablebase is not None:
+            agent_kwargs["tablebase_dir"] = agent.tablebase.directory
+
+        for i in range(1, workers):
+            jobs = ctx.Queue()
+            p = ctx.Process(
+                target=_helper_main,
+                args=(i, self.shm, bits, dict(agent_kwargs), jobs, self.results, self.stop_event),
+                daemon=True,
+            )
+            p.start()
+            self.jobs.append(jobs)
+            self.procs.append(p)
+
+        # wait until every helper has imported and built its agent, so the
+        # start-up is not paid for by the first search
+        limit = time.monotonic() + HELPER_START_TIMEOUT
+        for _ in self.procs:
+            try:
+                self.results.get(timeout=max(0.0, limit - time.monotonic()))
+            except queue.Empty:
+                break
+
+    def search(self, state, last_move=None):
+        """Run the agent's search with helpers; returns (best_move, best_val)."""
+        agent = self.agent
+        self.search_id += 1
+        agent.new_search()
+
+        job = (self.search_id, state.white, state.black, state.side, state.en_passant,
+               last_move, agent._deadline, agent.depth)
+        for jobs in self.jobs:
+            jobs.put(job)
+
+        best_move, best_val = agent._iterate(Board.from_state(state), last_move)
+        best_depth = agent.iterations[-1]["depth"] if agent.iterations else 0
+
+        # stop the helpers and collect their results for this search
+        self.stop_event.set()
+        pending = len(self.procs)
+        limit = time.monotonic() + HELPER_STOP_TIMEOUT
+        while pending:
+            try:
+                msg = self.results.get(timeout=max(0.0, limit - time.monotonic()))
+            except queue.Empty:
+                break
+            search_id, _, depth, score, move = msg
+            if search_id != self.search_id:
+                continue
+            if depth is None:
+                agent.helper_nodes += score
+                pending -= 1
+            elif depth > best_depth and move is not None:
+                best_depth, best_val, best_move = depth, score, move
+        self.stop_event.clear()
+
+        return best_move, best_val
+
+    def close(self):
+        for jobs in self.jobs:
+            jobs.put(None)
+        for p in self.procs:
+            p.join(timeout=HELPER_STOP_TIMEOUT)
+            if p.is_alive():
+                p.terminate()
+        self.agent.tt.release()
+        self.agent.tt = TranspositionTable(self.bits)
+        self.shm.close()
+        self.shm.unlink()
+
+
+# -------------------------
+# Root split
+# -------------------------
+# warm per-process agent of the root-split pool (see _root_worker_init)
+_worker_agent = None
+_worker_search_id = None
+_worker_barrier = None
+
+
+def _root_worker_init(agent_kwargs, barrier):
+    global _worker_agent, _worker_barrier
+    _worker_barrier = barrier
+    # imported here: alphabeta_agent imports this module
+    from source_code_files.agents.alphabeta_agent import AlphaBetaAgent
+
+    tablebase_dir = agent_kwargs.pop("tablebase_dir", None)
+    if tablebase_dir is not None:
+        from source_code_files.game.tablebase import Tablebase
+        agent_kwargs["tablebase"] = Tablebase(tablebase_dir)
+
+    _worker_agent = AlphaBetaAgent(**agent_kwargs)
+    _worker_agent.verbose = False
+
+
+def _root_worker_ping(_):
+    # every process holds one ping until all are initialized: one ping per process
+    try:
+        _worker_barrier.wait(HELPER_START_TIMEOUT)
+    except threading.BrokenBarrierError:
+        pass
+    return _worker_agent is not None
+
+
+def _root_worker_search(job):
+    """Search one root move with a fixed window. Returns (move, score or None on timeout, nodes)."""
+    global _worker_search_id
+    search_id, white, black, side, en_passant, move, depth, alpha, beta, deadline = job
+    agent = _worker_agent
+
+    # the table and history stay warm across moves (aged) and games
+    if search_id != _worker_search_id:
+        _worker_search_id = search_id
+        agent.new_search()
+
+    agent.nodes = 0
+    agent.qnodes = 0
+    agent._start_search_clock()
+    agent._deadline = deadline
+
+    board = Board.from_state(GameState(white=white, black=black, side=side, en_passant=en_passant))
+    board.make_move(move)
+    try:
+        val = -agent._alphabeta(board, depth - 1, -beta, -alpha, last_move=move)
+    except TimeoutError:
+        val = None
+    return move, val, agent.nodes + agent.qnodes
+
+
+class RootSplit:
+    """
+    Root splitting on a persistent process pool: the first (PV) root move
+    is searched in this process, the others are sent to the pool with the
+    resulting alpha as the window. Pool processes keep a warm agent
+    (own transposition table) for the whole game / tournament.
+    At the deadline, queued work is cancelled and running work stops on
+    its own clock check.
+    """
+
+    def __init__(self, agent, workers):
+        self.agent = agent
+        self.workers = workers
+        self.search_id = 0
+
+        agent_kwargs = {
+            "depth": agent.depth,
+            "tt_bits": agent.tt.mask.bit_length(),
+            "poll_latency": agent.poll_latency,
+            "eval_cache_bits": agent.eval_cache_bits,
+            **agent.search_options(),
+        }
+        if agent.tablebase is not None:
+            agent_kwargs["tablebase_dir"] = agent.tablebase.directory
+
+        # start and initialize every process now (before the game clock runs), not on the first search
+        barrier = mp.get_context().Barrier(workers)
+        self.pool = ProcessPoolExecutor(max_workers=workers, initializer=_root_worker_init,
+                                        initargs=(agent_kwargs, barrier))
+        list(self.pool.map(_root_worker_ping, range(workers)))
+
+    def new_search(self):
+        self.search_id += 1
+
+    def search_moves(self, board, moves, depth, alpha, beta):
+        """
+        [(move, score)] for moves (searched with window alpha, beta), in the
+        given order. Raises TimeoutError if the agent's deadline passes first.
+        """
+        agent = self.agent
+        deadline = agent._deadline
+        futures = [
+            self.pool.submit(_root_worker_search, (
+                self.search_id, board.white, board.black, board.side, board.en_passant,
+                move, depth, alpha, beta, deadline,
+            ))
+            for move in moves
+        ]
+
+        timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+        done, not_done = wait(futures, timeout=timeout)
+        if not_done:
+            for f in not_done:
+                f.cancel()
+            agent._stop = True
+            raise TimeoutError
+
+        results = {}
+        for f in done:
+            move, val, nodes = f.result()
+            agent.helper_nodes += nodes
+            if val is None:
+                agent._stop = True
+                raise TimeoutError
+            results[move] = val
+        return [(move, results[move]) for move in moves]
+
+    def close(self):
+        self.pool.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,119 @@
+import argparse
+import time
+from multiprocessing import Pool
+
+from game.board import Board
+from game.moves import generate_moves, move_to_str
+from game.terminal import is_terminal
+from protocol import setup_to_state
+from play_local import DEFAULT_SETUP
+
+
+# ─────────────────────────────────────────────
+# Perft
+# ─────────────────────────────────────────────
+
+def perft(board, depth, cache=None):
+    """
+    Number of leaf nodes depth plies below board.
+    Terminal positions (is_terminal) end the game, so they have no children.
+    cache: optional dict {(key, depth): count} shared across the subtree.
+    """
+    if depth == 0:
+        return 1
+    if is_terminal(board):
+        return 0
+
+    moves = generate_moves(board)
+    if depth == 1:
+        return len(moves)
+
+    if cache is not None:
+        hit = cache.get((board.key, depth))
+        if hit is not None:
+            return hit
+
+    nodes = 0
+    for m in moves:
+        board.make_move(m)
+        nodes += perft(board, depth - 1, cache)
+        board.unmake_move()
+
+    if cache is not None:
+        cache[(board.key, depth)] = nodes
+    return nodes
+
+
+def divide(board, depth, cache=None):
+    # [(move, nodes)] for every root move
+    out = []
+    for m in generate_moves(board):
+        board.make_move(m)
+        out.append((m, perft(board, depth - 1, cache)))
+        board.unmake_move()
+    return out
+
+
+def board_from_setup(setup):
+    # accepts "Wa2 Wb2 ..." or the full "Setup Wa2 Wb2 ..." server message
+    if not setup.startswith("Setup"):
+        setup = "Setup " + setup
+    return Board.from_state(setup_to_state(setup))
+
+
+def run_position(job):
+    """One position, depths 1..max_depth. Returns [(depth, nodes, seconds)]."""
+    setup, max_depth, use_hash = job
+    board = board_from_setup(setup)
+    results = []
+    for d in range(1, max_depth + 1):
+        cache = {} if use_hash else None
+        t0 = time.perf_counter()
+        nodes = perft(board, d, cache)
+        results.append((d, nodes, time.perf_counter() - t0))
+    return setup, results
+
+
+def print_report(setup, results):
+    print(f"\n[{setup}]")
+    for d, nodes, secs in results:
+        nps = int(nodes / secs) if secs > 0 else 0
+        print(f"depth = {d} | nodes = {nodes} | time = {secs:.3f}s | nps = {nps}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Perft / move generation benchmark")
+    parser.add_argument("--depth", type=int, default=4)
+    parser.add_argument("--setup", action="append",
+                        help="SETUP string (as in client.setup_to_state), may be repeated")
+    parser.add_argument("--divide", action="store_true", help="node count per root move")
+    parser.add_argument("--hash", action="store_true", help="cache subtree counts by Zobrist key")
+    parser.add_argument("--jobs", type=int, default=1, help="positions searched in parallel processes")
+    args = parser.parse_args()
+
+    setups = args.setup or [DEFAULT_SETUP]
+
+    if args.divide:
+        for setup in setups:
+            board = board_from_setup(setup)
+            cache = {} if args.hash else None
+            total = 0
+            print(f"\n[{setup}]")
+            for m, nodes in divide(board, args.depth, cache):
+                print(f"{move_to_str(m)}: {nodes}")
+                total += nodes
+            print(f"total: {total}")
+        return
+
+    jobs = [(s, args.depth, args.hash) for s in setups]
+    if args.jobs > 1 and len(jobs) > 1:
+        with Pool(args.jobs) as pool:
+            for setup, results in pool.imap(run_position, jobs):
+                print_report(setup, results)
+    else:
+        for job in jobs:
+            print_report(*run_position(job))
+
+
+if __name__ == "__main__":
+    main()
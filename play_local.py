@@ -2,7 +2,7 @@ import time
 
 from game.state import GameState
 from game.apply_move import apply_move
-from game.moves import generate_moves
+from game.moves import generate_moves, move_from, move_to, move_to_str
 from game.terminal import is_terminal
 from agents.alphabeta_agent import AlphaBetaAgent
 
@@ -14,18 +14,6 @@ BRIGHT = "\033[1m"
 BG_GREEN = "\033[42m"
 
 
-# ─────────────────────────────────────────────
-# Algebraic helpers
-# ─────────────────────────────────────────────
-
-def alg_to_sq(a):
-    return (int(a[1]) - 1) * 8 + (ord(a[0]) - ord('a'))
-
-
-def sq_to_alg(sq):
-    return f"{chr(ord('a') + sq % 8)}{sq // 8 + 1}"
-
-
 # ─────────────────────────────────────────────
 # ASCII board
 # ─────────────────────────────────────────────
@@ -35,7 +23,7 @@ def print_board(state, last_move=None, highlight_targets=None,
 
 
     """
-    last_move: (from_sq, to_sq) or None
+    last_move: packed move (see game.moves) or None
     highlight_targets: set of squares (to_sq) to mark as legal moves
     """
     highlight_targets = highlight_targets or set()
@@ -45,7 +33,7 @@ def print_board(state, last_move=None, highlight_targets=None,
     prev_from = None
     prev_color = None
     if last_move:
-        prev_from, _ = last_move
+        prev_from = move_from(last_move)
         prev_color = GREEN if state.side == 'b' else RED
         # הסבר: אם עכשיו BLACK בתור → WHITE זז קודם → ירוק
 
@@ -157,7 +145,7 @@ def main():
     state = setup_to_state(setup)
 
     # ── Agent
-    agent = AlphaBetaAgent(depth=4)
+    agent = AlphaBetaAgent()
 
 
     human_side = 'w'
@@ -176,13 +164,14 @@ def main():
         if state.side == human_side:
 
             moves = generate_moves(state)
-            legal = {(f, t): sq_to_alg(f) + sq_to_alg(t) for f, t in moves}
+            legal = {m: move_to_str(m) for m in moves}
             targets = set()
             capture_targets = set()
 
             enemy = state.black if state.side == 'w' else state.white
 
-            for f, t in moves:
+            for m in moves:
+                t = move_to(m)
                 targets.add(t)
                 if enemy & (1 << t):
                     capture_targets.add(t)
@@ -202,9 +191,9 @@ def main():
                     print("You resigned.")
                     return
 
-                for (f, t), s in legal.items():
+                for m, s in legal.items():
                     if s == user:
-                        last_move = (f, t)
+                        last_move = m
                         state = apply_move(state, last_move)
                         elapsed = time.time() - turn_start
                         human_time -= elapsed
@@ -244,7 +233,7 @@ def main():
                 print("Agent resigns / timeout.")
                 break
 
-            print(f"Agent plays: {sq_to_alg(move[0])}{sq_to_alg(move[1])}")
+            print(f"Agent plays: {move_to_str(move)}")
             last_move = move
             state = apply_move(state, move)
 
@@ -0,0 +1,147 @@
+from dataclasses import dataclass
+
+from game.state import GameState
+
+
+# ─────────────────────────────────────────────
+# Line framing
+# ─────────────────────────────────────────────
+
+class LineReader:
+    """
+    Buffered line reader: recv_into a reusable buffer, split on newlines.
+    One recv per network packet instead of one per byte.
+    """
+
+    def __init__(self, sock, bufsize=4096):
+        self.sock = sock
+        self._buf = bytearray(bufsize)
+        self._view = memoryview(self._buf)
+        self._pending = bytearray()     # received, not yet returned
+
+    def readline(self):
+        """Next line without the newline (and without a trailing CR)."""
+        while True:
+            i = self._pending.find(b"\n")
+            if i >= 0:
+                line = self._pending[:i]
+                del self._pending[:i + 1]
+                return line.decode().strip()
+
+            n = self.sock.recv_into(self._view)
+            if n == 0:
+                raise ConnectionError("Server closed connection")
+            # common case: the packet is exactly one line, skip the pending buffer
+            if not self._pending and self._buf.find(b"\n", 0, n) == n - 1:
+                return self._buf[:n - 1].decode().strip()
+            self._pending += self._view[:n]
+
+
+def send_line(sock, msg):
+    sock.sendall((msg + "\n").encode())
+
+
+class Connection:
+    """
+    Socket + LineReader. echo prints every line (">>> " sent, "<<< " received),
+    after it has been sent so the print never delays the move.
+    """
+
+    def __init__(self, sock, echo=True):
+        self.sock = sock
+        self.reader = LineReader(sock)
+        self.echo = echo
+
+    def send(self, msg):
+        send_line(self.sock, msg)
+        if self.echo:
+            print(f">>> {msg}")
+
+    def recv(self):
+        msg = self.reader.readline()
+        if self.echo:
+            print(f"<<< {msg}")
+        return msg
+
+    def recv_message(self):
+        return parse_message(self.recv())
+
+    def close(self):
+        self.sock.close()
+
+
+# ─────────────────────────────────────────────
+# Messages
+# ─────────────────────────────────────────────
+
+SETUP = "Setup"
+TIME = "Time"
+BEGIN = "Begin"
+RESET = "Reset"
+GAME_OVER = "GameOver"
+MOVE = "Move"
+EXIT = "exit"
+OK = "OK"
+TOURNAMENT_ACCEPTED = "TournamentAccepted"
+OTHER = "Other"
+
+
+@dataclass
+class Message:
+    kind: str
+    text: str                        # the raw line
+    state: GameState | None = None   # SETUP: start position (White to move)
+    minutes: float | None = None     # TIME: game time per side
+    move: str | None = None          # MOVE: wire format, e.g. "e2e4"
+
+
+def setup_to_state(msg):
+    # "Setup Wa2 Wb2 ... Bh7" -> GameState, White to move
+    tokens = msg.split()[1:]
+    white = 0
+    black = 0
+
+    for t in tokens:
+        color = t[0]
+        file = ord(t[1]) - ord('a')
+        rank = int(t[2]) - 1
+        sq = rank * 8 + file
+        if color == 'W':
+            white |= 1 << sq
+        else:
+            black |= 1 << sq
+
+    return GameState(white=white, black=black, side='w', en_passant=None)
+
+
+def state_to_setup(state):
+    # inverse of setup_to_state, without the "Setup " prefix (side / en passant are not sent)
+    tokens = []
+    for color, bb in (("W", state.white), ("B", state.black)):
+        while bb:
+            sq = (bb & -bb).bit_length() - 1
+            tokens.append(f"{color}{chr(ord('a') + sq % 8)}{sq // 8 + 1}")
+            bb &= bb - 1
+    return " ".join(tokens)
+
+
+def is_move_text(text):
+    return (len(text) == 4 and "a" <= text[0] <= "h" and "1" <= text[1] <= "8"
+            and "a" <= text[2] <= "h" and "1" <= text[3] <= "8")
+
+
+def parse_message(text):
+    """Classify one protocol line."""
+    if text.startswith(SETUP):
+        return Message(SETUP, text, state=setup_to_state(text))
+    if text.startswith(TIME):
+        return Message(TIME, text, minutes=float(text.split()[1]))
+    if text.startswith(GAME_OVER):
+        return Message(GAME_OVER, text)
+    if text.startswith(TOURNAMENT_ACCEPTED):
+        return Message(TOURNAMENT_ACCEPTED, text)
+    if text in (BEGIN, RESET, EXIT, OK):
+        return Message(text, text)
+    if is_move_text(text):
+        return Message(MOVE, text, move=text)
+    return Message(OTHER, text)
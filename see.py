@@ -0,0 +1,43 @@
+from source_code_files.game.moves import WHITE_PAWN_ATTACKS, BLACK_PAWN_ATTACKS
+
+PAWN_VALUE = 100
+PROMOTION_VALUE = 10_000   # landing on the last rank ends the game
+
+
+def see_capture(white, black, side, move):
+    """
+    Static exchange evaluation of a capture, from the mover's point of view.
+
+    Pawn-only: every piece in the exchange is worth PAWN_VALUE and pawns
+    never x-ray, so the swap list only needs the attacker count of each side
+    on the target square. Either side may stop capturing at any point.
+    A capture onto the mover's last rank promotes and ends the game.
+    """
+    to_sq = (move >> 6) & 63
+
+    if side == 'w':
+        if to_sq >= 56:
+            return PROMOTION_VALUE
+        # attackers of the target square (a black pawn there would attack
+        # exactly those squares); the capturing pawn is one of them
+        ours = (BLACK_PAWN_ATTACKS[to_sq] & white).bit_count() - 1
+        theirs = (WHITE_PAWN_ATTACKS[to_sq] & black).bit_count()
+    else:
+        if to_sq < 8:
+            return PROMOTION_VALUE
+        ours = (WHITE_PAWN_ATTACKS[to_sq] & black).bit_count() - 1
+        theirs = (BLACK_PAWN_ATTACKS[to_sq] & white).bit_count()
+
+    # swap list: gains[i] = material balance for the side making capture i
+    gains = [PAWN_VALUE]
+    counts = [ours, theirs]
+    turn = 1
+    while counts[turn] > 0:
+        counts[turn] -= 1
+        gains.append(PAWN_VALUE - gains[-1])
+        turn ^= 1
+
+    for i in range(len(gains) - 1, 0, -1):
+        gains[i - 1] = -max(-gains[i - 1], gains[i])
+
+    return gains[0]
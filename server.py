@@ -0,0 +1,191 @@
+import argparse
+import os
+import random
+import socket
+import time
+
+from game.apply_move import apply_move
+from game.moves import generate_moves, str_to_move, move_to_str
+from protocol import Connection, setup_to_state, state_to_setup, is_move_text
+from match import outcome, loss_for, random_opening, write_game_log, MAX_PLIES
+from play_local import DEFAULT_SETUP
+
+
+# extra seconds a client gets before a missing move counts as a time loss
+GRACE = 1.0
+
+
+# ─────────────────────────────────────────────
+# Players
+# ─────────────────────────────────────────────
+
+class Player:
+    def __init__(self, index, sock, verbose):
+        self.index = index
+        self.sock = sock
+        self.conn = Connection(sock, echo=False)
+        self.verbose = verbose
+        self.points = 0.0
+
+    def send(self, msg):
+        self.conn.send(msg)
+        if self.verbose:
+            print(f"[{self.index}] >>> {msg}")
+
+    def recv(self, timeout=None):
+        self.sock.settimeout(timeout)
+        msg = self.conn.recv()
+        if self.verbose:
+            print(f"[{self.index}] <<< {msg}")
+        return msg
+
+    def expect(self, text):
+        # a client that has not seen the game end yet may still send a move
+        while True:
+            msg = self.recv()
+            if msg == text:
+                return
+            if not (is_move_text(msg) or msg == "exit"):
+                raise RuntimeError(f"player {self.index}: expected {text}, got {msg}")
+
+
+# ─────────────────────────────────────────────
+# One game
+# ─────────────────────────────────────────────
+
+def play_game(white, black, state, minutes, max_plies):
+    """Relay moves between the two players. Returns (result, reason, [packed moves])."""
+    players = {'w': white, 'b': black}
+    clocks = {'w': minutes * 60.0, 'b': minutes * 60.0}
+    moves = []
+
+    white.send("Begin")
+    while True:
+        over = outcome(state)
+        if over is not None:
+            return over[0], over[1], moves
+        if len(moves) >= max_plies:
+            return "1/2-1/2", "max plies", moves
+
+        side = state.side
+        mover = players[side]
+        t0 = time.monotonic()
+        try:
+            msg = mover.recv(timeout=clocks[side] + GRACE)
+        except (socket.timeout, ConnectionError):
+            return loss_for(side), "time / disconnect", moves
+        clocks[side] -= time.monotonic() - t0
+
+        if clocks[side] < 0:
+            return loss_for(side), "time", moves
+        if msg == "exit":
+            return loss_for(side), "resigned", moves
+        if not is_move_text(msg):
+            return loss_for(side), f"bad message {msg!r}", moves
+
+        mv = str_to_move(state, msg)
+        if mv not in generate_moves(state):
+            return loss_for(side), f"illegal move {msg}", moves
+
+        state = apply_move(state, mv)
+        moves.append(mv)
+        players['b' if side == 'w' else 'w'].send(msg)
+
+
+# ─────────────────────────────────────────────
+# Main
+# ─────────────────────────────────────────────
+
+def main():
+    parser = argparse.ArgumentParser(description="Python stand-in for server2p (two clients, client.py protocol)")
+    parser.add_argument("port", type=int)
+    parser.add_argument("--games", type=int, default=1, help="games in the tournament (Reset between them)")
+    parser.add_argument("--time", type=float, default=5.0, help="minutes per side per game")
+    parser.add_argument("--setup", default=DEFAULT_SETUP)
+    parser.add_argument("--swap", action="store_true", help="alternate colours every game")
+    parser.add_argument("--random-plies", type=int, default=0,
+                        help="random opening plies per game (rounded down to even: White moves first)")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--max-plies", type=int, default=MAX_PLIES)
+    parser.add_argument("--log-dir", default=None, help="write each game in book format here")
+    parser.add_argument("-v", "--verbose", action="store_true", help="print every protocol line")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    plies = args.random_plies - args.random_plies % 2
+    start = setup_to_state("Setup " + args.setup)
+    if args.log_dir:
+        os.makedirs(args.log_dir, exist_ok=True)
+
+    srv = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    srv.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    srv.bind(("0.0.0.0", args.port))
+    srv.listen(2)
+    print(f"listening on {args.port}")
+
+    # sides by connection order: the first client plays White in game 1
+    players = []
+    for i in range(2):
+        sock, addr = srv.accept()
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        players.append(Player(i, sock, args.verbose))
+        print(f"player {i} connected from {addr[0]}:{addr[1]}")
+    for p in players:
+        p.expect("OK")
+
+    setup_sent = None
+    for game in range(args.games):
+        if game > 0:
+            for p in players:
+                p.send("Reset")
+            for p in players:
+                p.expect("Ready")
+
+        state, opening = random_opening(start, plies, rng) if plies else (start, [])
+        setup = state_to_setup(state)
+        # play from the position the clients get: Setup carries no en passant square
+        state = setup_to_state("Setup " + setup)
+        if setup != setup_sent:
+            for p in players:
+                p.send(f"Setup {setup}")
+                p.expect("OK")
+                p.send(f"Time {args.time:g}")
+                p.expect("OK")
+            setup_sent = setup
+
+        white, black = players[0], players[1]
+        if args.swap and game % 2 == 1:
+            white, black = black, white
+
+        result, reason, moves = play_game(white, black, state, args.time, args.max_plies)
+        for p in players:
+            p.send(f"GameOver {result}")
+
+        if result == "1/2-1/2":
+            white.points += 0.5
+            black.points += 0.5
+        elif result == "1-0":
+            white.points += 1
+        else:
+            black.points += 1
+
+        print(f"game {game + 1}: player {white.index} (W) - player {black.index} (B) {result} "
+              f"({reason}, {len(moves)} plies) | score {players[0].points} - {players[1].points}")
+
+        if args.log_dir:
+            write_game_log(args.log_dir, {
+                "id": game, "setup": setup, "result": result,
+                "moves": [move_to_str(m) for m in moves],
+            })
+
+    for p in players:
+        try:
+            p.send("exit")
+        except OSError:
+            pass
+        p.sock.close()
+    srv.close()
+
+
+if __name__ == "__main__":
+    main()
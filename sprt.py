@@ -0,0 +1,168 @@
+import argparse
+import json
+import math
+from multiprocessing import Pool
+
+from match import make_jobs, play_game, score_for
+from play_local import DEFAULT_SETUP
+
+
+# ─────────────────────────────────────────────
+# Statistics
+# ─────────────────────────────────────────────
+
+def elo_to_score(elo):
+    return 1.0 / (1.0 + 10.0 ** (-elo / 400.0))
+
+
+def score_to_elo(score):
+    score = min(max(score, 1e-6), 1.0 - 1e-6)
+    return -400.0 * math.log10(1.0 / score - 1.0)
+
+
+def bounds(alpha, beta):
+    """(lower, upper) LLR bounds: below lower accept H0, above upper accept H1."""
+    return math.log(beta / (1.0 - alpha)), math.log((1.0 - beta) / alpha)
+
+
+class Sprt:
+    """
+    Generalized SPRT, normal approximation: H0: elo = elo0, H1: elo = elo1.
+    Games 2k and 2k + 1 share an opening with colours swapped (make_jobs),
+    so they are scored together: the statistic is the pair's average score
+    for A (pentanomial, 0 / 0.25 / ... / 1), with the variance of the pairs
+    played so far. Scoring the games of a pair as independent would
+    overstate the information in them whenever the opening favours a side.
+    """
+
+    def __init__(self, elo0, elo1, alpha, beta):
+        self.s0 = elo_to_score(elo0)
+        self.s1 = elo_to_score(elo1)
+        self.lower, self.upper = bounds(alpha, beta)
+        self.wins = 0
+        self.draws = 0
+        self.losses = 0
+        # pairs by A's total score in half points: 0, 0.5, 1, 1.5, 2
+        self.pentanomial = [0] * 5
+        self._unpaired = {}     # game id -> A's score, waiting for the other game of its pair
+
+    def add(self, game_id, score):
+        """A's score (1 / 0.5 / 0) in game game_id, in any order of completion."""
+        if score == 1.0:
+            self.wins += 1
+        elif score == 0.5:
+            self.draws += 1
+        else:
+            self.losses += 1
+
+        other = self._unpaired.pop(game_id ^ 1, None)
+        if other is None:
+            self._unpaired[game_id] = score
+        else:
+            self.pentanomial[round(2 * (score + other))] += 1
+
+    @property
+    def games(self):
+        return self.wins + self.draws + self.losses
+
+    @property
+    def pairs(self):
+        return sum(self.pentanomial)
+
+    def mean_var(self):
+        # mean and variance of the per-pair average score
+        n = self.pairs
+        mean = sum(k * c for k, c in enumerate(self.pentanomial)) / (4 * n)
+        var = sum((k / 4) ** 2 * c for k, c in enumerate(self.pentanomial)) / n - mean * mean
+        return mean, var
+
+    def llr(self):
+        if self.pairs == 0:
+            return 0.0
+        mean, var = self.mean_var()
+        if var <= 0.0:
+            # all pairs scored the same so far: no information about the spread yet
+            return 0.0
+        return self.pairs * (self.s1 - self.s0) * (2.0 * mean - self.s0 - self.s1) / (2.0 * var)
+
+    def decision(self):
+        llr = self.llr()
+        if llr >= self.upper:
+            return "H1"
+        if llr <= self.lower:
+            return "H0"
+        return None
+
+    def elo(self):
+        """(elo, lower, upper) of A with a 95% confidence interval, None before the first pair."""
+        if self.pairs == 0:
+            return None
+        mean, var = self.mean_var()
+        margin = 1.96 * math.sqrt(var / self.pairs)
+        return score_to_elo(mean), score_to_elo(mean - margin), score_to_elo(mean + margin)
+
+
+# ─────────────────────────────────────────────
+# Main
+# ─────────────────────────────────────────────
+
+def main():
+    parser = argparse.ArgumentParser(description="SPRT of engine A against engine B (stops once H0 or H1 is accepted)")
+    parser.add_argument("--a", default="{}", help="JSON kwargs of AlphaBetaAgent A (the candidate)")
+    parser.add_argument("--b", default="{}", help="JSON kwargs of AlphaBetaAgent B (the baseline)")
+    parser.add_argument("--elo0", type=float, default=0.0, help="H0: A is this many Elo stronger")
+    parser.add_argument("--elo1", type=float, default=10.0, help="H1: A is this many Elo stronger")
+    parser.add_argument("--alpha", type=float, default=0.05, help="false positive rate")
+    parser.add_argument("--beta", type=float, default=0.05, help="false negative rate")
+    parser.add_argument("--max-games", type=int, default=20000)
+    parser.add_argument("--minutes", type=float, default=0.5, help="game time per side")
+    parser.add_argument("--setup", default=DEFAULT_SETUP)
+    parser.add_argument("--plies", type=int, default=4, help="random opening plies")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--jobs", type=int, default=None, help="parallel games (default: all cores)")
+    parser.add_argument("--out", default=None, help="also write one JSON result per game here")
+    args = parser.parse_args()
+
+    a = json.loads(args.a)
+    b = json.loads(args.b)
+    jobs = make_jobs(args.max_games, args.seed, args.setup, args.plies, args.minutes, a, b)
+
+    test = Sprt(args.elo0, args.elo1, args.alpha, args.beta)
+    print(f"H0: elo {args.elo0:g}  H1: elo {args.elo1:g}  "
+          f"LLR bounds [{test.lower:.2f}, {test.upper:.2f}]")
+
+    out = open(args.out, "w") if args.out else None
+    decision = None
+    # leaving the with block terminates the games still running
+    with Pool(args.jobs) as pool:
+        for rec in pool.imap_unordered(play_game, jobs):
+            if out:
+                out.write(json.dumps(rec) + "\n")
+                out.flush()
+            test.add(rec["id"], score_for(rec, "A"))
+            decision = test.decision()
+            print(f"game {test.games:>5}: +{test.wins} ={test.draws} -{test.losses}  "
+                  f"pairs {test.pairs}  LLR {test.llr():+.2f}")
+            if decision:
+                break
+    if out:
+        out.close()
+
+    print(f"\n{test.games} games: +{test.wins} ={test.draws} -{test.losses}")
+    print("pairs (A scoring 0 / 0.5 / 1 / 1.5 / 2): " + " / ".join(map(str, test.pentanomial)))
+    elo = test.elo()
+    if elo is None:
+        print(f"no completed pair: no Elo estimate  LLR {test.llr():+.2f}")
+    else:
+        elo, lo, hi = elo
+        print(f"Elo {elo:+.1f} [{lo:+.1f}, {hi:+.1f}] (95%)  LLR {test.llr():+.2f}")
+    if decision == "H1":
+        print("H1 accepted: A is stronger")
+    elif decision == "H0":
+        print("H0 accepted: A is not stronger")
+    else:
+        print("no decision within --max-games")
+
+
+if __name__ == "__main__":
+    main()
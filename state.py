@@ -1,8 +1,15 @@
 from dataclasses import dataclass
 
+from source_code_files.game.zobrist import compute_hash
+
 @dataclass
 class GameState:
     white: int
     black: int
     side: str            # 'w' or 'b'
-    en_passant: int | None
\ No newline at end of file
+    en_passant: int | None
+    key: int | None = None   # Zobrist key (computed if not given)
+
+    def __post_init__(self):
+        if self.key is None:
+            self.key = compute_hash(self.white, self.black, self.side, self.en_passant)
@@ -0,0 +1,269 @@
+import mmap
+import os
+import re
+import struct
+import time
+from math import comb
+from multiprocessing import Pool
+
+from source_code_files.game.board import Board
+from source_code_files.game.moves import generate_moves
+from source_code_files.game.terminal import is_terminal
+
+# -------------------------
+# File format
+# -------------------------
+# One file per material signature, "<nw>v<nb>.ptb":
+#   header  magic, nw, nb, number of entries (HEADER)
+#   body    one byte per position index (see position_index)
+#
+# Byte codes, from the side to move's point of view:
+#   0              not a position (two pawns on one square)
+#   DRAW           draw (no side can force a win)
+#   WIN_BASE + d   win, game ends after d plies
+#   LOSS_BASE + d  loss, game ends after d plies
+#
+# Only pawns on ranks 2-7 without an en passant square are stored;
+# en passant positions are solved from their children when probed.
+# A position with no legal move is scored as a draw.
+MAGIC = b"PTB1"
+HEADER = struct.Struct("<4sBBxxQ")
+FILE_PATTERN = re.compile(r"^(\d)v(\d)\.ptb$")
+
+DRAW = 1
+WIN_BASE = 1
+LOSS_BASE = 128
+
+TB_WIN = 10_000
+
+INNER = 0x00FFFFFFFFFFFF00      # squares 8..55
+INNER_SQUARES = 48
+
+# COMB[n][k] = C(n, k)
+COMB = [[comb(n, k) for k in range(9)] for n in range(INNER_SQUARES + 1)]
+
+
+def table_size(nw, nb):
+    return COMB[INNER_SQUARES][nw] * COMB[INNER_SQUARES][nb] * 2
+
+
+def table_name(nw, nb):
+    return f"{nw}v{nb}.ptb"
+
+
+def _comb_index(bb):
+    # colex rank of the set bits, squares 8..55 relabelled 0..47
+    bb >>= 8
+    idx = 0
+    k = 1
+    while bb:
+        sq = (bb & -bb).bit_length() - 1
+        idx += COMB[sq][k]
+        k += 1
+        bb &= bb - 1
+    return idx
+
+
+def position_index(white, black, side):
+    """Index of an inner, en-passant-free position inside its signature's table."""
+    nb = black.bit_count()
+    idx = _comb_index(white) * COMB[INNER_SQUARES][nb] + _comb_index(black)
+    return (idx << 1) | (side == 'b')
+
+
+def code_to_score(code):
+    # search score for the side to move; shorter wins score higher
+    if code == DRAW:
+        return 0
+    if code >= LOSS_BASE:
+        return -(TB_WIN - (code - LOSS_BASE))
+    return TB_WIN - (code - WIN_BASE)
+
+
+# -------------------------
+# Solver
+# -------------------------
+def _solve(board, tables, memo):
+    """
+    Byte code of a non-terminal inner position.
+    tables: {(nw, nb): byte buffer}, must hold this signature and every
+    signature reachable by a capture. Unsolved entries (0) of a writable
+    buffer are filled in; en passant positions are cached in memo.
+    """
+    white = board.white
+    black = board.black
+    ep = board.en_passant
+
+    if ep is None:
+        table = tables[(white.bit_count(), black.bit_count())]
+        idx = position_index(white, black, board.side)
+        code = table[idx]
+        if code:
+            return code
+    else:
+        memo_key = (white, black, board.side, ep)
+        code = memo.get(memo_key)
+        if code is not None:
+            return code
+
+    # moves are irreversible (pawns only go forward), so this recursion
+    # always ends: captures leave the signature, pushes advance a pawn
+    win = None      # shortest win found
+    draw = False
+    loss = 0        # longest loss found
+    moves = generate_moves(board)
+    for m in moves:
+        board.make_move(m)
+        if is_terminal(board):
+            # a move can only end the game in the mover's favour
+            board.unmake_move()
+            win = 1
+            break
+        child = _solve(board, tables, memo)
+        board.unmake_move()
+
+        if child == DRAW:
+            draw = True
+        elif child >= LOSS_BASE:
+            d = child - LOSS_BASE + 1
+            if win is None or d < win:
+                win = d
+        else:
+            d = child - WIN_BASE + 1
+            if d > loss:
+                loss = d
+
+    if not moves:
+        code = DRAW
+    elif win is not None:
+        assert win < LOSS_BASE - WIN_BASE
+        code = WIN_BASE + win
+    elif draw:
+        code = DRAW
+    else:
+        assert loss < 256 - LOSS_BASE
+        code = LOSS_BASE + loss
+
+    if ep is None:
+        table[idx] = code
+    else:
+        memo[memo_key] = code
+    return code
+
+
+def _solve_signature(job):
+    """Worker: build and write the table of one signature. Returns (nw, nb, wins, draws, losses, seconds)."""
+    directory, nw, nb = job
+    t0 = time.perf_counter()
+
+    tb = Tablebase(directory)
+    tables = dict(tb.tables)
+    table = bytearray(table_size(nw, nb))
+    tables[(nw, nb)] = table
+    memo = {}
+
+    # one board reused for every position; its key / evaluation
+    # accumulator are never read here
+    board = Board(0, 0, 'w', None, 0)
+    for wsq in _combinations(nw):
+        for bsq in _combinations(nb):
+            if wsq & bsq:
+                continue
+            for side in 'wb':
+                board.white = wsq
+                board.black = bsq
+                board.side = side
+                board.en_passant = None
+                board._undo.clear()
+                _solve(board, tables, memo)
+
+    path = os.path.join(directory, table_name(nw, nb))
+    with open(path + ".tmp", "wb") as f:
+        f.write(HEADER.pack(MAGIC, nw, nb, len(table)))
+        f.write(table)
+    os.replace(path + ".tmp", path)
+
+    wins = sum(1 for c in table if WIN_BASE < c < LOSS_BASE)
+    draws = table.count(DRAW)
+    losses = sum(1 for c in table if c >= LOSS_BASE)
+    return nw, nb, wins, draws, losses, time.perf_counter() - t0
+
+
+def _combinations(n):
+    # every bitboard with n pawns on squares 8..55
+    def rec(start, left, bb):
+        if left == 0:
+            yield bb
+            return
+        for sq in range(start, 56 - left + 1):
+            yield from rec(sq + 1, left - 1, bb | (1 << sq))
+    return rec(8, n, 0)
+
+
+def generate_tables(directory, max_pawns=2, jobs=None, force=False):
+    """
+    Build every table with 1..max_pawns pawns per side into directory.
+    Signatures are solved in order of total pawn count (a capture only
+    leads to a smaller total); signatures with the same total are
+    independent and run in a process pool. Existing files are kept
+    unless force. Yields the _solve_signature result of each table.
+    """
+    os.makedirs(directory, exist_ok=True)
+    with Pool(jobs) as pool:
+        for total in range(2, 2 * max_pawns + 1):
+            todo = []
+            for nw in range(1, max_pawns + 1):
+                nb = total - nw
+                if not 1 <= nb <= max_pawns:
+                    continue
+                if not force and os.path.exists(os.path.join(directory, table_name(nw, nb))):
+                    continue
+                todo.append((directory, nw, nb))
+            yield from pool.imap_unordered(_solve_signature, todo)
+
+
+# -------------------------
+# Probing
+# -------------------------
+class Tablebase:
+    """
+    Read-only tables of a directory, memory-mapped.
+    max_pawns is the largest K with every signature up to K v K present.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.tables = {}
+
+        for name in sorted(os.listdir(directory)):
+            m = FILE_PATTERN.match(name)
+            if m is None:
+                continue
+            nw, nb = int(m.group(1)), int(m.group(2))
+            path = os.path.join(directory, name)
+            with open(path, "rb") as f:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, fnw, fnb, entries = HEADER.unpack_from(mm)
+            if (magic, fnw, fnb) != (MAGIC, nw, nb) or entries != table_size(nw, nb) \
+                    or len(mm) != HEADER.size + entries:
+                raise ValueError(f"bad tablebase file {path}")
+            self.tables[(nw, nb)] = memoryview(mm)[HEADER.size:]
+
+        k = 0
+        while all((i, j) in self.tables for i in range(1, k + 2) for j in range(1, k + 2)):
+            k += 1
+        self.max_pawns = k
+
+    def probe(self, board):
+        """
+        Score for the side to move (TB_WIN - plies, 0, or -(TB_WIN - plies)),
+        or None if the position is not covered. board must be a Board
+        (en passant positions are solved with make / unmake).
+        """
+        white = board.white
+        black = board.black
+        if not white or not black or (white | black) & ~INNER:
+            return None
+        if white.bit_count() > self.max_pawns or black.bit_count() > self.max_pawns:
+            return None
+        return code_to_score(_solve(board, self.tables, {}))
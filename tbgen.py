@@ -0,0 +1,27 @@
+import argparse
+import time
+
+from game.tablebase import generate_tables, table_size
+
+
+# ─────────────────────────────────────────────
+# Pawn endgame tablebase generator
+# ─────────────────────────────────────────────
+
+def main():
+    parser = argparse.ArgumentParser(description="Build win / draw / loss tables for small pawn endgames")
+    parser.add_argument("--dir", default="tables", help="output directory")
+    parser.add_argument("--pawns", type=int, default=2, help="max pawns per side")
+    parser.add_argument("--jobs", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--force", action="store_true", help="rebuild tables that already exist")
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    for nw, nb, wins, draws, losses, secs in generate_tables(args.dir, args.pawns, args.jobs, args.force):
+        print(f"{nw}v{nb}: entries = {table_size(nw, nb)} | wins = {wins} | draws = {draws} | "
+              f"losses = {losses} | time = {secs:.1f}s")
+    print(f"done in {time.perf_counter() - t0:.1f}s -> {args.dir}")
+
+
+if __name__ == "__main__":
+    main()
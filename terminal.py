@@ -8,4 +8,13 @@ def is_terminal(state):
     if state.black & 0x00000000000000FF:
         return True
 
-    return False
\ No newline at end of file
+    return False
+
+
+def winner(state):
+    """'w' / 'b' if the position is terminal (see is_terminal), None otherwise."""
+    if state.black == 0 or state.white & 0xFF00000000000000:
+        return 'w'
+    if state.white == 0 or state.black & 0x00000000000000FF:
+        return 'b'
+    return None
@@ -0,0 +1,50 @@
+from agents.alphabeta_agent import AlphaBetaAgent, WINDOW
+from agents.timeman import TimeManager
+from play_local import DEFAULT_SETUP, setup_to_state
+
+# root score from depth 3 on: far below the depth-2 score of 0
+DROP = 300
+
+
+class FailLowAgent(AlphaBetaAgent):
+    """
+    Every move below the root scores 0 for the opponent up to depth 2 and
+    DROP from depth 3 on, so the real root search fails low at depth 3.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.windows = []
+
+    def _root_alphabeta(self, board, depth, alpha, beta, last_move=None):
+        self.windows.append((depth, alpha, beta))
+        return super()._root_alphabeta(board, depth, alpha, beta, last_move)
+
+    def _alphabeta(self, board, depth_remaining, alpha, beta, last_move):
+        score = 0 if depth_remaining < 2 else DROP
+        return max(alpha, min(beta, score))
+
+
+def test_fail_low_is_researched_and_extends_time():
+    agent = FailLowAgent(depth=3)
+    agent.start_game(5.0)
+    agent.choose_move(setup_to_state(DEFAULT_SETUP))
+
+    # the aspiration window around 0 fails low at depth 3 and is widened
+    assert agent.windows[2] == (3, -WINDOW, WINDOW)
+    assert [w[1] for w in agent.windows[3:]] == [-2 * WINDOW, -4 * WINDOW, -8 * WINDOW]
+
+    # the re-searched score reaches the time manager and extends the budget
+    assert [(it["depth"], it["score"]) for it in agent.iterations] == [(1, 0), (2, 0), (3, -DROP)]
+    assert agent.timeman.scale > 1.0
+    assert agent.moves_played == 1
+
+
+def test_score_drop_scales_soft_budget():
+    tm = TimeManager()
+    soft, _ = tm.start(60.0, 0, 16, 20)
+    tm.next_iteration(1, 1, 0, 0.0, 10)
+    tm.next_iteration(2, 1, 0, 0.0, 40)
+    assert tm.scale == 1.0
+    tm.next_iteration(3, 1, -DROP, 0.0, 160)
+    assert tm.scale > 1.0
@@ -0,0 +1,111 @@
+# agents/timeman.py
+
+# -------------------------
+# Budget
+# -------------------------
+# expected number of our moves still to play: MOVES_PER_PAWN per pawn on
+# the board, less the moves we already played, clamped to [MIN, MAX]
+MOVES_PER_PAWN = 1.5
+MIN_MOVES_TO_GO = 8
+MAX_MOVES_TO_GO = 30
+
+# hard budget: HARD_FACTOR soft budgets, never more than MAX_FRACTION of the clock
+HARD_FACTOR = 5.0
+MAX_FRACTION = 0.3
+
+# kept back for move transmission and the process around the search (seconds)
+SAFETY_MARGIN = 0.05
+
+# -------------------------
+# Iterations
+# -------------------------
+# branching factor assumed until two iterations have been measured
+DEFAULT_EBF = 4.0
+# a next iteration may run up to this many (scaled) soft budgets
+MAX_OVERRUN = 2.0
+
+# extensions: the soft budget is scaled by 1 + instability + score drop, at most MAX_SCALE
+CHANGE_BONUS = 0.5      # added to instability when the best move changes
+INSTABILITY_DECAY = 0.5  # per completed iteration
+SCORE_DROP = 30         # score falls of at least this much extend...
+DROP_BONUS = 0.5        # ...by this much per SCORE_DROP
+MAX_SCALE = 3.0
+
+# scores this large are decided (promotion / tablebase win): deeper search won't change them
+DECIDED_SCORE = 9000
+
+
+class TimeManager:
+    """
+    Per-move time allocation for the iterative deepening loop.
+
+    start() sets a soft and a hard budget from the clock, the number of
+    moves played and the pawns left. The hard budget is the search deadline;
+    the soft one decides whether another iteration is started
+    (next_iteration), scaled up while the best move keeps changing or the
+    score drops. An iteration is only started if its predicted cost
+    (last iteration's time x measured branching factor) fits.
+    """
+
+    def __init__(self):
+        self.soft = 0.0
+        self.hard = 0.0
+        self.scale = 1.0
+        self.ebf = DEFAULT_EBF
+        self._instability = 0.0
+        self._drop = 0.0
+        self._last = None           # (depth, move, score, time, nodes) of the last iteration
+        self._prev_iter = None      # (time, nodes) spent by the one before it
+
+    def start(self, time_left, moves_played, pawns, legal_moves=2):
+        """Budgets (soft, hard) in seconds for this move; moves_played counts our moves only."""
+        usable = max(0.0, time_left - SAFETY_MARGIN)
+        moves_to_go = MOVES_PER_PAWN * pawns - moves_played
+        moves_to_go = max(MIN_MOVES_TO_GO, min(MAX_MOVES_TO_GO, moves_to_go))
+
+        self.hard = min(usable * MAX_FRACTION, usable / moves_to_go * HARD_FACTOR)
+        # a forced move gets the least time that still finds it
+        self.soft = 0.0 if legal_moves <= 1 else min(self.hard, usable / moves_to_go)
+
+        self.scale = 1.0
+        self.ebf = DEFAULT_EBF
+        self._instability = 0.0
+        self._drop = 0.0
+        self._last = None
+        self._prev_iter = None
+        return self.soft, self.hard
+
+    def next_iteration(self, depth, move, score, elapsed, nodes):
+        """
+        Record a completed iteration (elapsed seconds / nodes since the
+        search started) and return True if the next one should be started.
+        """
+        if self._last is not None:
+            _, last_move, last_score, last_time, last_nodes = self._last
+            iter_time, iter_nodes = elapsed - last_time, nodes - last_nodes
+
+            self._instability *= INSTABILITY_DECAY
+            if move != last_move:
+                self._instability += CHANGE_BONUS
+            if score <= last_score - SCORE_DROP:
+                self._drop = max(self._drop, DROP_BONUS * (last_score - score) / SCORE_DROP)
+            elif score >= last_score:
+                self._drop = 0.0
+
+            if self._prev_iter is not None and self._prev_iter[1] > 0:
+                self.ebf = max(1.0, iter_nodes / self._prev_iter[1])
+            self._prev_iter = (iter_time, iter_nodes)
+        else:
+            self._prev_iter = (elapsed, nodes)
+        self._last = (depth, move, score, elapsed, nodes)
+
+        if abs(score) >= DECIDED_SCORE:
+            return False
+
+        self.scale = min(MAX_SCALE, 1.0 + self._instability + self._drop)
+        soft = self.soft * self.scale
+        if elapsed >= soft:
+            return False
+
+        predicted = self._prev_iter[0] * self.ebf
+        return elapsed + predicted <= min(self.hard, soft * MAX_OVERRUN)
@@ -0,0 +1,136 @@
+# agents/transposition.py
+from array import array
+from multiprocessing import shared_memory
+
+# bound types
+EXACT = 1
+LOWER = 2   # score is a lower bound (fail high)
+UPPER = 3   # score is an upper bound (fail low)
+
+# packed entry layout (one 64-bit word):
+#   bits  0..31  score + SCORE_OFFSET
+#   bits 32..47  packed move (see moves.py), NO_MOVE if none
+#   bits 48..55  depth
+#   bits 56..57  bound
+#   bits 58..63  generation (search age)
+SCORE_OFFSET = 1 << 31
+NO_MOVE = 0xFFFF
+GEN_MASK = 0x3F
+
+
+class TranspositionTable:
+    """
+    Fixed-size, array-backed transposition table (one entry per slot).
+
+    Every slot stores the key xor-ed with its data word, so a torn or
+    foreign entry simply fails the key check on probe.
+    Replacement: empty slot, entry from an older search, or a search at
+    least as deep as the stored one. For the same position a shallower
+    result (e.g. quiescence at depth 0) only replaces the stored one if it
+    is EXACT and the stored one is a bound.
+
+    buffer: optional writable buffer of table_bytes(bits) bytes (e.g. a
+    SharedMemory.buf) to hold the table instead of private arrays; several
+    processes can then probe / store concurrently without locks, the
+    key xor data check rejects entries torn by a concurrent write.
+    """
+
+    def __init__(self, bits=20, buffer=None):
+        self.size = 1 << bits
+        self.mask = self.size - 1
+        self.generation = 0
+        self._raw = None
+
+        if buffer is None:
+            self.keys = array('Q', bytes(8 * self.size))
+            self.data = array('Q', bytes(8 * self.size))
+        else:
+            raw = memoryview(buffer).cast('B')
+            if len(raw) < table_bytes(bits):
+                raise ValueError(f"buffer too small for a {bits}-bit table")
+            self._raw = raw[:table_bytes(bits)]
+            self.keys = self._raw[:8 * self.size].cast('Q')
+            self.data = self._raw[8 * self.size:].cast('Q')
+
+    def clear(self):
+        if self._raw is not None:
+            # shared: zero in place, other processes keep their views
+            self._raw[:] = bytes(len(self._raw))
+        else:
+            self.keys = array('Q', bytes(8 * self.size))
+            self.data = array('Q', bytes(8 * self.size))
+        self.generation = 0
+
+    def release(self):
+        # drop the views of a shared buffer so its SharedMemory can be closed
+        if self._raw is not None:
+            self.keys.release()
+            self.data.release()
+            self._raw.release()
+            self._raw = None
+            self.keys = self.data = None
+
+    def new_search(self):
+        # called once per root search; older entries become replaceable
+        self.generation = (self.generation + 1) & GEN_MASK
+
+    def probe(self, key):
+        """Return (depth, score, bound, move) or None."""
+        i = key & self.mask
+        data = self.data[i]
+        if data == 0 or (self.keys[i] ^ data) != key:
+            return None
+        move = (data >> 32) & 0xFFFF
+        return (
+            (data >> 48) & 0xFF,
+            (data & 0xFFFFFFFF) - SCORE_OFFSET,
+            (data >> 56) & 3,
+            move if move != NO_MOVE else None,
+        )
+
+    def best_move(self, key):
+        entry = self.probe(key)
+        return entry[3] if entry is not None else None
+
+    def store(self, key, depth, score, bound, move):
+        i = key & self.mask
+        old = self.data[i]
+
+        if old != 0:
+            same = (self.keys[i] ^ old) == key
+            old_depth = (old >> 48) & 0xFF
+            old_gen = old >> 58
+            if old_gen == self.generation and depth < old_depth:
+                if not same or bound != EXACT or (old >> 56) & 3 == EXACT:
+                    return
+            # keep the old best move if this result has none
+            if same and move is None:
+                move = (old >> 32) & 0xFFFF
+
+        data = (
+            ((score + SCORE_OFFSET) & 0xFFFFFFFF)
+            | ((NO_MOVE if move is None else move) << 32)
+            | ((depth & 0xFF) << 48)
+            | (bound << 56)
+            | (self.generation << 58)
+        )
+        self.data[i] = data
+        self.keys[i] = key ^ data
+
+
+def table_bytes(bits):
+    # keys + data words
+    return 16 << bits
+
+
+def shared_table(bits=20, name=None):
+    """
+    (SharedMemory, TranspositionTable) backed by it. With name, attach to
+    an existing block, otherwise create a new zeroed one.
+    The caller keeps the SharedMemory alive and closes / unlinks it.
+    """
+    if name is None:
+        shm = shared_memory.SharedMemory(create=True, size=table_bytes(bits))
+    else:
+        shm = shared_memory.SharedMemory(name=name)
+    return shm, TranspositionTable(bits, shm.buf)
@@ -0,0 +1,40 @@
+import random
+
+# Fixed seed so keys are identical across runs and processes
+# (the transposition table and any stored book/table files rely on it).
+_rng = random.Random(0x5EED_C0DE)
+
+ZOBRIST_WHITE = [_rng.getrandbits(64) for _ in range(64)]
+ZOBRIST_BLACK = [_rng.getrandbits(64) for _ in range(64)]
+ZOBRIST_EP = [_rng.getrandbits(64) for _ in range(64)]
+ZOBRIST_SIDE = _rng.getrandbits(64)   # xor-ed in when black is to move
+
+del _rng
+
+
+def compute_hash(white, black, side, en_passant):
+    """
+    Full Zobrist key of a position (used once per root state;
+    apply_move updates the key incrementally after that).
+    """
+    key = 0
+
+    bb = white
+    while bb:
+        sq = (bb & -bb).bit_length() - 1
+        key ^= ZOBRIST_WHITE[sq]
+        bb &= bb - 1
+
+    bb = black
+    while bb:
+        sq = (bb & -bb).bit_length() - 1
+        key ^= ZOBRIST_BLACK[sq]
+        bb &= bb - 1
+
+    if side == 'b':
+        key ^= ZOBRIST_SIDE
+
+    if en_passant is not None:
+        key ^= ZOBRIST_EP[en_passant]
+
+    return key